@@ -1,15 +1,27 @@
+import os
+import time
 import streamlit as st
-import FinanceDataReader as fdr
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import requests
+
+import perf
+from cards import buy_card
+from charts import CHART_WIDTH, RANGES, compare_figure, from_spec, price_figure, to_spec
+from investor import InvestorClient
+from ohlcv_cache import OhlcvCache
+from scanner import LATEST, load_latest, save, scan
+from signals import add_indicators
+from universe import Universe
 
 # --- 1. 앱 설정 및 프리미엄 스타일 ---
 st.set_page_config(page_title="SON STOCK PRO", page_icon="📈", layout="centered")
 
+# 리런 계측: 단계별 시간은 매 실행마다 새로, 캐시 적중 수는 세션 동안 누적
+rerun_t0 = time.perf_counter()
+timer = perf.activate(st.session_state.setdefault('perf', perf.StageTimer()))
+timer.reset_stages()
+
 st.markdown("""
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Pretendard:wght@400;700;800&display=swap');
@@ -28,127 +40,69 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- 2. 분석 엔진 ---
-def calculate_rsi(df, period=14):
-    delta = df['Close'].diff()
-    up, down = delta.copy(), delta.copy()
-    up[up < 0], down[down > 0] = 0, 0
-    _gain = up.ewm(com=(period - 1), min_periods=period).mean()
-    _loss = down.abs().ewm(com=(period - 1), min_periods=period).mean()
-    RS = _gain / _loss
-    return 100 - (100 / (1 + RS))
-
-def get_investor_data(code):
-    try:
-        url = f"https://m.stock.naver.com/api/stock/{code}/investor"
-        res = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}).json()
-        latest = res['result'][0]
-        return (int(latest['institutionNetBuyVolume']), int(latest['foreignNetBuyVolume']))
-    except: return 0, 0
-
-# 🌟 절대 에러 안 나는 하드코딩 우량주 리스트 (웹 통신 없음! 즉시 켜짐!)
-STOCK_LIST = {
-# 🌟 에러/중복/상장폐지 완벽 제거! 코스피/코스닥 핵심 우량주 무결점 리스트
-# 🌟 에러/중복/상장폐지 완벽 제거! 코스피/코스닥 핵심 우량주 무결점 리스트
-    '삼성전자':'005930', 'SK하이닉스':'000660', 'LG에너지솔루션':'373220', '삼성바이오로직스':'207940', '현대차':'005380', 
-    '기아':'000270', '셀트리온':'068270', 'POSCO홀딩스':'005490', 'NAVER':'035420', '현대위아':'011210', 
-    'LG화학':'051910', '포스코퓨처엠':'003670', '삼성SDI':'006400', '카카오':'035720', '삼성물산':'028260', 
-    'KB금융':'105560', '현대모비스':'012330', '신한지주':'055550', 'LG전자':'066570', '삼성화재':'000810',
-    '삼성생명':'032830', '하나금융지주':'086790', '한국전력':'015760', 'KT&G':'033780', 'HMM':'011200',
-    '두산에너빌리티':'034020', '현대글로비스':'086280', '고려아연':'010130', '삼성SDS':'018260', '삼성전기':'009150', 
-    'HD현대중공업':'329180', 'LG':'003550', '우리금융지주':'316140', '기업은행':'024110', '엔씨소프트':'036570',
-    '한화솔루션':'009830', '아모레퍼시픽':'090430', '롯데케미칼':'011170', '현대제철':'004020', 'S-Oil':'010950', 
-    'KT':'030200', '유한양행':'000100', '크래프톤':'259960', '한온시스템':'018880', '두산':'000150', 
-    '한화오션':'042660', '한화에어로스페이스':'012450', 'KCC':'002380', '현대해상':'001450', '코웨이':'021240', 
-    'CJ':'001040', 'SK':'034730', 'SK텔레콤':'017670', 'LG이노텍':'011070', '삼성엔지니어링':'028050', 
-    '삼성중공업':'010140', 'GS':'078930', '미래에셋증권':'006800', '포스코DX':'022100', 'SKC':'011790',
-    '삼성증권':'016360', '한국타이어앤테크놀로지':'161390', '대우건설':'047040', 'DB손해보험':'005830', '롯데지주':'004990', 
-    '한미사이언스':'008930', '삼성카드':'029780', '대한항공':'003490', '한국금융지주':'071050', '팬오션':'028670', 
-    '키움증권':'039490', '현대건설':'000720', '에코프로비엠':'247540', '에코프로':'086520', 'HLB':'028300', 
-    '알테오젠':'196170', '엔켐':'348370', 'HPSP':'403870', '리노공업':'058470', '셀트리온제약':'068760', 
-    '레인보우로보틱스':'277810', '동진쎄미켐':'005290', '솔브레인':'357780', '신성델타테크':'065350', '클래시스':'214150', 
-    '휴젤':'145020', '삼천당제약':'000250', '카카오게임즈':'293490', '펄어비스':'263750', '위메이드':'112040', 
-    'JYP Ent.':'035900', '에스엠':'041510', '와이지엔터테인먼트':'122870', '하이브':'352820', '더존비즈온':'012510', 
-    'DB하이텍':'000990', '신세계':'004170', '아모레G':'002790', 'BGF리테일':'282330', '이마트':'139480', 
-    '녹십자':'006280', '오리온홀딩스':'001800', '오리온':'271560', '현대백화점':'069960', '한전기술':'052690', 
-    '한전KPS':'051600', '하이트진로':'000080', '롯데칠성':'005300', '한솔케미칼':'014680', '포스코인터내셔널':'047050', 
-    '호텔신라':'008770', 'DL':'000210', 'DL이앤씨':'375500', '신세계인터내셔날':'031430', 'HDC':'012630', 
-    '농심':'004370', '오뚜기':'007310', '아세아제지':'002310', 'HD한국조선해양':'009540', 'HD현대':'267250', 
-    '두산밥캣':'241560', 'GS건설':'006360', '영풍':'000670', 'LX인터내셔널':'001120', 'CJ대한통운':'000120', 
-    '에스원':'012750', '제일기획':'030000', '현대미포조선':'010620', '현대로템':'064350', 'LIG넥스원':'079550', 
-    '한국항공우주':'047810', '한화시스템':'272210', 'LS':'006260', 'LS일렉트릭':'010120', '풍산':'103140', 
-    'OCI홀딩스':'010060', '금호석유':'011780', '효성티앤씨':'298020', '효성첨단소재':'298050', '코스모신소재':'005070', 
-    '코스모화학':'005420', '이수스페셜티케미컬':'457190', '동국제강':'460860', '세아베스틸지주':'001430', '세아제강':'306200', 
-    'KG모빌리티':'003620', '에스엘':'005850', '화신':'010690', '서연이화':'200880', '성우하이텍':'015750', 
-    '아진산업':'013310', '대원강업':'000430', '한국가스공사':'036460', '지역난방공사':'071320', 'SK가스':'018670', 
-    'E1':'017940', '현대그린푸드':'453340', '농심홀딩스':'072710', '대상':'001680', '빙그레':'005180', 
-    '매일유업':'267980', '삼양식품':'003230', 'SPC삼립':'005610', '롯데웰푸드':'280360', '크라운해태홀딩스':'000240', 
-    '동원F&B':'049770', '종근당':'185750', '대웅제약':'069620', '보령':'003850', 'JW중외제약':'001060', 
-    '일동제약':'249420', '동아에스티':'170900', '환인제약':'016580', '대원제약':'003220', '하나투어':'039130', 
-    '모두투어':'080160', '노랑풍선':'104620', '참좋은여행':'094850', '파라다이스':'034230', 'GKL':'114090', 
-    '강원랜드':'035250', '롯데관광개발':'032350', '신라교역':'004970', '동원산업':'006040', '사조산업':'007160', 
-    'CJ프레시웨이':'051500', 'CJ ENM':'035760', '스튜디오드래곤':'253450', '콘텐트리중앙':'036420', 'NEW':'160550', 
-    '컴투스':'078340', '넥슨게임즈':'225570', '위메이드맥스':'101730', '골프존':'215000', 'SOOP':'067160', 
-    '다날':'064260', 'KG이니시스':'035600', '한국정보통신':'025770', 'NHN KCP':'060250', '비즈니스온':'138580', 
-    '웹케시':'053580', '쿠콘':'292200', '두산로보틱스':'454910', 'SK이노베이션':'096770', 'SK바이오팜':'326030', 
-    'SK바이오사이언스':'302440', '한미약품':'128940', 'LG생활건강':'051900', 'CJ제일제당':'097950', '한솔제지':'213500', 
-    '무림P&P':'009580', '태림포장':'011280', '대영포장':'014160', '한국수출포장':'002200', '신대양제지':'016590', 
-    '대림B&Co':'005750', '아이에스동서':'010780', '코오롱글로벌':'003070', 'KCC건설':'028100', '태영건설':'009410', 
-    '금호건설':'002990', '계룡건설':'013580', '서희건설':'035890', '동부건설':'005960', '한라':'014790', 
-    '일성건설':'013360', '남광토건':'001260', '삼부토건':'001470', '동아지질':'028100', '특수건설':'026150', 
-    '우원개발':'046940', '남화토건':'091590', '이화공영':'001840', '자연과환경':'043910', '코엔텍':'029960', 
-    '와이엔텍':'067900', '인선이엔티':'060150', 'KG ETS':'151860', '티와이홀딩스':'363280', '아이에이':'038880', 
-    '텔레칩스':'054450', '칩스앤미디어':'094360', '넥스트칩':'396270', '가온칩스':'399720', '오픈엣지테크놀로지':'394280', 
-    '퀄리타스반도체':'432720', '제주반도체':'080220', '어보브반도체':'102120', 'SFA반도체':'036540', '하나마이크론':'067310', 
-    '네패스':'033640', '두산테스나':'131970', '엘비세미콘':'061970', '테크윙':'089030', '해성디에스':'195870', 
-    '심텍':'222800', '대덕전자':'353200', '코리아써키트':'007810', '이수페타시스':'007660', '티엘비':'356860', 
-    '아비코전자':'036010', '인탑스':'049070', 'KH바텍':'060720', '파인엠텍':'441270', '세경하이테크':'148150', 
-    '비에이치':'090460', '인터플렉스':'051370', '디케이티':'290550', '아이티엠반도체':'084850', '덕산네오룩스':'213420', 
-    '이녹스첨단소재':'272290', '피엔에이치테크':'239890', '솔루스첨단소재':'336370', '에스에프에이':'056190', '원익IPS':'240810', 
-    '유진테크':'084370', '테스':'095610', '주성엔지니어링':'036930', '피에스케이':'319660', '넥스틴':'348210', 
-    '파크시스템스':'140860', '고영':'098460', '인텍플러스':'064290', '오로스테크놀로지':'322310', '기가비스':'420770', 
-    '프로텍':'053610', '한미반도체':'042700', '이오테크닉스':'039030', '제우스':'079370', '디아이':'003160', 
-    '와이아이케이':'232140', '에이팩트':'200470', '오션브릿지':'241790', '원익머트리얼즈':'104830', '티씨케이':'064760', 
-    '하나머티리얼즈':'166090', '원익QnC':'074600', '월덱스':'101160', '케이엔제이':'272110', '뉴파워프라즈마':'278280',
-    '카카오뱅크':'323410', '카카오페이':'377300', '넷마블':'251270', '더블유게임즈':'192080', '웹젠':'069080',
-    '네오위즈':'095660', '컴투스홀딩스':'063080', '데브시스터즈':'152030', '조이시티':'067000', '엠게임':'058630',
-    '액토즈소프트':'052790', '동아엘텍':'088130', '선익시스템':'171090', 'AP시스템':'265520', '덕산테코피아':'317330', 
-    'PI첨단소재':'136930', '이엔에프테크놀로지':'102710', '천보':'278280', '대주전자재료':'078600', '나노신소재':'121600', 
-    '성일하이텍':'365340', '새빗켐':'107600', '에코프로머티':'450080', 'LS머트리얼즈':'417200', '필에너지':'378340', 
-    '윤성에프앤씨':'372170', '탑머티리얼':'360070', '엠플러스':'259270', '하나기술':'299030', '코윈테크':'282880', 
-    '티에스아이':'277880', '씨아이에스':'222080', '피엔티':'137400', '디에이테크놀로지':'196490', '에이프로':'262260', 
-    '이노메트리':'302430', '엔시스':'333620', '브이원텍':'251630', '뷰노':'338220', '루닛':'328130', 
-    '딥노이드':'315640', '제이엘케이':'322510', '랩지노믹스':'084650', '바디텍메드':'206640', '수젠텍':'253840', 
-    '휴마시스':'205470', '씨젠':'096530', '바이오니아':'063160', '진원생명과학':'011000', '유바이오로직스':'206650', 
-    '차백신연구소':'261780', '보로노이':'310210', '퓨쳐켐':'220100', '툴젠':'199800', '지노믹트리':'228760', 
-    '압타바이오':'293780', '올릭스':'226950', '티움바이오':'321550', '에이비엘바이오':'298380', '리그켐바이오':'141080', 
-    '오스코텍':'039200', '한올바이오파마':'009420', '메지온':'140410', '에스티팜':'237690', '바이넥스':'053030', 
-    '파마리서치':'214450', '휴메딕스':'200670', '메디톡스':'086900', '대웅':'003090', '동국제약':'086450', 
-    '유나이티드제약':'033270', '영진약품':'003520', '부광약품':'003000', '명문제약':'017180', '국제약품':'002720', 
-    '일양약품':'007570', '신풍제약':'019170', '삼진제약':'005500', '진양제약':'007370', '고려제약':'014570', 
-    '경동제약':'011040', '안국약품':'001540', '현대약품':'004310', '삼아제약':'009300', '비씨월드제약':'200780', 
-    '테라젠이텍스':'066700', '코미팜':'041960', '메디포스트':'078160', '차바이오텍':'085660', '강스템바이오텍':'217730', 
-    '안트로젠':'065660', '파미셀':'005690', '네이처셀':'007390', '신라젠':'215600', '코오롱티슈진':'950160', 
-    '에이치엘비생명과학':'067630', '에이치엘비제약':'047920', 'CG인바이츠':'083790', '메드팩토':'235980', '제넥신':'095700', 
-    '유틸렉스':'263050', '앱클론':'174900', '엔케이맥스':'182400', '박셀바이오':'323990', '고바이오랩':'348150', 
-    '지놈앤컴퍼니':'314130', 'CJ바이오사이언스':'311690', '에스디바이오센서':'137310', 'HK이노엔':'195940', '드래곤플라이':'030350', 
-    '미스터블루':'207760', '키다리스튜디오':'032190', '디앤씨미디어':'263720', '대원미디어':'048910', '애니플러스':'310200', 
-    '삼화네트웍스':'046390', '초록뱀미디어':'047820', '팬엔터테인먼트':'068050', '에이스토리':'241840', '쇼박스':'086980', 
-    'CJ CGV':'079160', '아난티':'025980', '대명소노시즌':'007720', '용평리조트':'070960', '신세계푸드':'031440', 
-    '광주신세계':'037710', 'TBH글로벌':'084870', '신원':'009270', '코웰패션':'033290', '영원무역':'111110', 
-    '영원무역홀딩스':'009970', '한세실업':'105630', '한세예스24홀딩스':'016450', '화승엔터프라이즈':'241590', '백산':'035150', 
-    '태평양물산':'007980', 'LF':'093050', '한섬':'020000', '휠라홀딩스':'081660', 'F&F':'383220', 
-    'F&F홀딩스':'007700', '제이에스티나':'026040', '한국화장품':'123690', '한국화장품제조':'003350', '코리아나':'027050', 
-    '잇츠한불':'226320', '토니모리':'214420', '에이블씨엔씨':'078520', '클리오':'237880', '애경산업':'018250', 
-    '네오팜':'092730', '콜마비앤에이치':'200130', '코스맥스':'192820', '한국콜마':'161890', '코스메카코리아':'241710', 
-    '연우':'115960', '펌텍코리아':'251970', '씨앤씨인터내셔널':'352480', '실리콘투':'257720', '아이패밀리에스씨':'114840', 
-    '브이티':'018290', '마녀공장':'439090', '뷰티스킨':'406820', '에이피알':'278470', '덴티움':'145720', 
-    '디오':'039840', '레이':'228670', '바텍':'043150', '뷰웍스':'100120', '디알젬':'263690', 
-    '레이언스':'228850', '제테마':'216080', '바이오플러스':'099430', '원텍':'336570', '이루다':'164060', 
-    '제이시스메디칼':'287410', '하이로닉':'149980', '비올':'335890', '유비케어':'032620', '비트컴퓨터':'032850', 
-    '인피니트헬스케어':'071200', '이지케어텍':'099750', '케어랩스':'263700', '메가스터디교육':'215200', '메가스터디':'045980', 
-    '디지털대성':'068930', '정상제이엘에스':'040420', '크레버스':'096240', '멀티캠퍼스':'067280', '아이스크림에듀':'289010', 
-    '비상교육':'100220', '대교':'019680', '웅진씽크빅':'095720', 'YBM넷':'057030'
-}
+@st.cache_resource
+def get_ohlcv_cache():
+    # 프로세스당 하나: 탭1/탭2 모두 디스크 캐시를 거쳐서 읽는다 (웜 상태면 증분 1봉만 다운로드)
+    return OhlcvCache()
+
+@st.cache_resource
+def get_universe():
+    # 로컬 KRX 상장 스냅샷을 프로세스당 한 번만 읽어 검색 인덱스까지 만들어 둔다
+    return Universe.load()
+
+@st.cache_resource
+def get_investor_client():
+    # 커넥션 풀 세션과 거래일 단위 수급 캐시를 리런 사이에 공유
+    return InvestorClient()
+
+# --- 3. 리런 캐시: 위젯을 건드릴 때마다 스크립트 전체가 다시 돌므로 비싼 단계는 키/TTL을 붙여 재사용 ---
+# (키 = 종목코드 + 조회 시작일 -> 날짜가 바뀌면 자연히 새 키, 장중 봉 갱신은 TTL로)
+@st.cache_data(ttl=60, show_spinner=False)
+def load_history(code, start):
+    perf.count_miss('시세')
+    return get_ohlcv_cache().read(code, start)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_indicators(code, start):
+    perf.count_miss('지표')
+    return add_indicators(cached('시세', load_history, code, start))
+
+def start_of(days):
+    return (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+
+@st.cache_data(ttl=60, show_spinner=False)
+def figure_spec(code, days, width):
+    # (종목, 기간, 폭)마다 다운샘플링까지 끝낸 그림을 JSON으로 보관. 1년 이하는 탭1 지표 프레임을 그대로 재사용
+    perf.count_miss('차트')
+    df = cached('지표', load_indicators, code, start_of(max(days, 365)))
+    return to_spec(price_figure(df.loc[start_of(days):], width))
+
+@st.cache_data(ttl=60, show_spinner=False)
+def compare_spec(codes, days, width):
+    perf.count_miss('비교 차트')
+    universe = get_universe()
+    closes = {universe.name(c): cached('시세', load_history, c, start_of(days))['Close'] for c in codes}
+    return to_spec(compare_figure(closes, width))
+
+def cached(name, fn, *args):
+    perf.count_call(name)
+    return fn(*args)
+
+def load_scan():
+    # 스캔 결과는 세션에 (파일 수정 시각을 키로) 들고 있다가 파일이 바뀔 때만 다시 읽는다
+    perf.count_call('스캔 결과')
+    mtime = os.path.getmtime(LATEST) if os.path.exists(LATEST) else None
+    held = st.session_state.get('scan')
+    if held is None or held['mtime'] != mtime:
+        perf.count_miss('스캔 결과')
+        held = st.session_state['scan'] = {'mtime': mtime, 'table': load_latest() if mtime else None}
+    return held['table'], mtime
+
+def clear_caches():
+    for fn in (load_history, load_indicators, figure_spec, compare_spec):
+        fn.clear()
+    for key in ('scan', 'analysis'):
+        st.session_state.pop(key, None)
 
 tab1, tab2 = st.tabs(["📊 개별 종목 분석", "⚡ 당일 매수 스캐너"])
 
@@ -156,21 +110,26 @@ tab1, tab2 = st.tabs(["📊 개별 종목 분석", "⚡ 당일 매수 스캐너"
 # 탭 1: 개별 분석
 # ==========================================
 with tab1:
+    universe = get_universe()
+    query = st.text_input("종목 검색", placeholder="종목명 / 초성(ㅅㅅㅈㅈ) / 코드", label_visibility="collapsed")
     col_l, col_r = st.columns([3, 1])
     with col_l:
-        target_name = st.selectbox("분석할 종목 선택", list(STOCK_LIST.keys()), label_visibility="collapsed")
+        # 전체 목록 대신 검색 결과만 렌더링 (빈 검색어면 상위 종목)
+        code = st.selectbox("분석할 종목 선택", universe.search(query, limit=50), format_func=lambda c: f"{universe.name(c)} ({c})", label_visibility="collapsed")
     with col_r:
         analyze_btn = st.button("RUN AI", use_container_width=True)
     
-    if analyze_btn:
-        code = STOCK_LIST[target_name]
-        with st.spinner('시장 데이터를 분석 중입니다...'):
-            df = fdr.DataReader(code, (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d'))
-            if not df.empty and len(df) >= 25:
-                df['MA10'] = df['Close'].rolling(10).mean()
-                df['MA20'] = df['Close'].rolling(20).mean()
-                df['RSI'] = calculate_rsi(df)
-                
+    # 분석 결과는 세션에 종목코드로 남겨 두고, 다른 위젯을 건드려도 캐시에서 바로 다시 그린다
+    if analyze_btn and code:
+        st.session_state['analysis'] = code
+    code = st.session_state.get('analysis')
+    
+    if code:
+        start = start_of(365)
+        with st.spinner('시장 데이터를 분석 중입니다...'), perf.stage('탭1 시세+지표'):
+            df = cached('지표', load_indicators, code, start)
+        if not df.empty and len(df) >= 25:
+            with perf.stage('탭1 렌더링'):
                 # 매매 타이밍 진단
                 is_golden = df['MA10'].iloc[-2] <= df['MA20'].iloc[-2] and df['MA10'].iloc[-1] > df['MA20'].iloc[-1]
                 rsi_val = df['RSI'].iloc[-1]
@@ -196,88 +155,86 @@ with tab1:
                 with m2: st.markdown(f'<div class="metric-card"><small>RSI (14일)</small><br><b style="font-size:1.5rem;">{rsi_val:.1f}</b></div>', unsafe_allow_html=True)
                 with m3: st.markdown(f'<div class="metric-card"><small>거래량 (대비)</small><br><b style="font-size:1.5rem;">{vol_ratio:.0f}%</b></div>', unsafe_allow_html=True)
 
-                fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.06, row_heights=[0.7, 0.3])
-                df_r = df.iloc[-80:]
-                fig.add_trace(go.Scatter(x=df_r.index, y=df_r['Close'], name='Price', line=dict(color='#111827', width=2.5)), row=1, col=1)
-                fig.add_trace(go.Scatter(x=df_r.index, y=df_r['MA10'], name='10MA', line=dict(color='#ef4444', width=1.5, dash='dot')), row=1, col=1)
-                fig.add_trace(go.Scatter(x=df_r.index, y=df_r['MA20'], name='20MA', line=dict(color='#f59e0b', width=1.5)), row=1, col=1)
-                fig.add_trace(go.Bar(x=df_r.index, y=df_r['Volume'], name='Vol', marker_color='#e5e7eb'), row=2, col=1)
-                fig.update_layout(template="plotly_white", height=500, margin=dict(l=0, r=0, t=10, b=0), showlegend=False, hovermode="x unified")
-                st.plotly_chart(fig, use_container_width=True)
+            # 기간이 길어져도 그리는 점 수는 차트 폭에 묶인다 (캔들 구간 집계 / 비교선 LTTB)
+            days = RANGES[st.radio("차트 기간", list(RANGES), horizontal=True, label_visibility="collapsed")]
+            with perf.stage('탭1 차트'):
+                st.plotly_chart(from_spec(cached('차트', figure_spec, code, days, CHART_WIDTH)), use_container_width=True)
+
+            # 비교 후보도 전체 목록 대신 검색 결과만 (이미 고른 종목은 검색어가 바뀌어도 남도록 앞에 붙임)
+            cmp_query = st.text_input("비교 종목 검색", placeholder="📈 수익률 비교: 종목명 / 초성 / 코드", label_visibility="collapsed")
+            picked = st.session_state.get('compare', [])
+            options = [c for c in dict.fromkeys(picked + universe.search(cmp_query, limit=30)) if c != code]
+            others = st.multiselect("📈 수익률 비교", options, max_selections=5, key='compare',
+                                    format_func=lambda c: f"{universe.name(c)} ({c})", placeholder="비교할 종목 추가")
+            if others:
+                with perf.stage('탭1 비교 차트'):
+                    st.plotly_chart(from_spec(cached('비교 차트', compare_spec, (code, *others), days, CHART_WIDTH)), use_container_width=True)
 
 # ==========================================
-# 탭 2: 스캐너 (자동 동적 분할 로직)
+# 탭 2: 스캐너 (배치 스캔 결과를 바로 렌더링)
 # ==========================================
 with tab2:
     st.markdown("#### ⚡ 당일 돌파(Day-1) 종목 스캐너")
     
-    # 🌟 스마트 쪼개기 시스템: 리스트 개수가 몇 개든 알아서 50개씩 잘라줍니다!
-    items = list(STOCK_LIST.items())
-    total_chunks = (len(items) + 49) // 50
-    options = [f"🔍 스캔 구간: {i*50 + 1}위 ~ {min((i+1)*50, len(items))}위" for i in range(total_chunks)]
+    universe = get_universe()
+    sort_by = st.radio("정렬 기준", ["거래량 급증순", "5일 수급 추세순"], horizontal=True)
     
-    selected_range = st.selectbox("스캔할 범위를 선택하세요 (50종목 단위 분할 스캔):", options)
-    
-    if st.button("🚀 매수 신호 스캔 시작", use_container_width=True):
-        idx = options.index(selected_range)
-        s, e = idx * 50, (idx + 1) * 50
-        target_list = items[s:e]
-        
-        results = []
+    # 평소에는 크론으로 돌린 `python scanner.py` 결과 파일만 읽는다 -> 앱을 열 때 네트워크 대기 없음
+    if st.button(f"🔄 지금 다시 스캔 (전체 {len(universe)}종목)", use_container_width=True):
         bar = st.progress(0)
-        
-        for i, (name, code) in enumerate(target_list):
-            try:
-                df_s = fdr.DataReader(code, (datetime.now() - timedelta(days=60)).strftime('%Y-%m-%d'))
-                if len(df_s) >= 25:
-                    df_s['MA10'] = df_s['Close'].rolling(10).mean()
-                    df_s['MA20'] = df_s['Close'].rolling(20).mean()
-                    
-                   # 1. 수학적 Day-1 골든크로스 확인
-                    is_cross = df_s['MA10'].iloc[-2] <= df_s['MA20'].iloc[-2] and df_s['MA10'].iloc[-1] > df_s['MA20'].iloc[-1]
-                    
-                    # 2. 주가 위치 확인: 현재 주가가 10일선과 20일선 위에 확실히 있는가? (음봉으로 파고드는 하락 방지)
-                    is_above_ma = df_s['Close'].iloc[-1] > df_s['MA10'].iloc[-1] and df_s['Close'].iloc[-1] > df_s['MA20'].iloc[-1]
-                    
-                    # 3. 실질 하락장 방지: 어제보다 올랐거나, 최소한 오늘 시가보다는 높은 양봉인가?
-                    is_not_falling = df_s['Close'].iloc[-1] >= df_s['Close'].iloc[-2] or df_s['Close'].iloc[-1] >= df_s['Open'].iloc[-1]
-                    
-                    # 이 3가지 깐깐한 조건을 모두 통과한 '진짜 상승' 종목만 리스트에 추가!
-                    if is_cross and is_above_ma and is_not_falling:
-                        rsi = calculate_rsi(df_s).iloc[-1]
-                        vol = (df_s['Volume'].iloc[-1] / df_s['Volume'].rolling(5).mean().iloc[-2] * 100) if df_s['Volume'].rolling(5).mean().iloc[-2] > 0 else 0
-                        inst, frgn = get_investor_data(code)
-                        results.append({'name': name, 'code': code, 'price': df_s['Close'].iloc[-1], 'vol': vol, 'rsi': rsi, 'inst': inst, 'frgn': frgn})
-            except: pass
-            bar.progress((i+1)/len(target_list))
-            
+        rows, failed = scan(universe.items(), cache=get_ohlcv_cache(), client=get_investor_client(),
+                            on_progress=lambda i, n: bar.progress(i / n))
         bar.empty()
-        
-        if results:
-            st.markdown(f"#### 🏆 오늘 터진 매수 추천주 ({len(results)}개 발견)")
-            for r in sorted(results, key=lambda x: x['vol'], reverse=True):
-                st.markdown(f"""
-                <div class="buy-card">
-                    <div style="display:flex; justify-content:space-between; align-items:center;">
-                        <b style="font-size:1.2rem; color:#111827;">{r['name']}</b>
-                        <b style="color:#2563eb; font-size:1.1rem;">{r['price']:,.0f} 원</b>
-                    </div>
-                    <div class="indicator-container">
-                        <div class="badge-premium">오늘 골든크로스 ✅</div>
-                        <div class="badge-premium">거래량 {r['vol']:.0f}% 🔥</div>
-                        <div class="badge-premium">RSI {r['rsi']:.1f} 🌡️</div>
-                    </div>
-                    <div class="supply-row">
-                        <b>기관 수급:</b> <span style="color:{'#ef4444' if r['inst']>0 else '#3b82f6'}">{r['inst']:,}</span> 주 | 
-                        <b>외인 수급:</b> <span style="color:{'#ef4444' if r['frgn']>0 else '#3b82f6'}">{r['frgn']:,}</span> 주
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+        # 전부 실패하면(네트워크 장애 등) 빈 결과로 지난 크론 스캔 파일을 덮지 않고 그대로 보여준다
+        if rows.empty:
+            st.error(f"데이터를 하나도 받지 못해 이전 스캔 결과를 유지합니다 (실패 {len(failed)}종목)")
         else:
-            st.info("🧐 선택하신 범위 내에서 '오늘(당일)' 골든크로스가 발생한 종목이 없습니다.")
+            save(rows)
+        if failed:
+            failed_names = [universe.name(c) if c in universe else c for c, _ in failed]
+            st.caption(f"⚠️ 데이터 수집 실패 {len(failed)}종목: {', '.join(failed_names[:10])}{' 외' if len(failed) > 10 else ''}")
+    
+    with perf.stage('탭2 스캔 결과'):
+        table, mtime = load_scan()
+    if table is None:
+        st.info("🕒 아직 스캔 결과가 없습니다. `python scanner.py` 를 장 시작 전/마감 후 크론으로 돌리거나 위 버튼으로 스캔하세요.")
+    else:
+        scanned_at = datetime.fromtimestamp(mtime)
+        last_date = table['last_date'].max()
+        st.caption(f"🕒 {scanned_at:%m/%d %H:%M} 스캔 · {len(table)}종목 · 기준일 {'-' if pd.isna(last_date) else f'{last_date:%Y-%m-%d}'}")
+        if pd.isna(last_date):
+            # 수집이 전부 실패하면 save()가 빈 결과 파일을 남긴다 -> 판정된 종목이 하나도 없음
+            st.warning("⚠️ 스캔 결과가 비어 있습니다 (데이터 수집이 모두 실패했거나 봉이 부족한 종목뿐). 잠시 후 다시 스캔하세요.")
+        with perf.stage('탭2 렌더링'):
+            hits = table[table['signal']]
+            if sort_by == "5일 수급 추세순":
+                hits = hits.sort_values('flow5', ascending=False, na_position='last')
+            else:
+                hits = hits.sort_values('vol', ascending=False)
+        
+            if len(hits):
+                st.markdown(f"#### 🏆 오늘 터진 매수 추천주 ({len(hits)}개 발견)")
+                for r in hits.to_dict('records'):
+                    st.markdown(buy_card(r), unsafe_allow_html=True)
+            elif not pd.isna(last_date):
+                st.info("🧐 전체 종목 중 '오늘(당일)' 골든크로스가 발생한 종목이 없습니다.")
 
 
 
 
 
 
+
+# ==========================================
+# 리런 계측: 이번 실행의 단계별 시간 + 세션 누적 캐시 적중률
+# ==========================================
+timer.stages['리런 전체'] = time.perf_counter() - rerun_t0
+timer.dump(source='app')  # SON_PERF_LOG 가 설정된 경우에만 JSONL 로 기록
+with st.expander("⏱️ 리런 계측"):
+    stage_rows, cache_rows = timer.rows()
+    st.dataframe(pd.DataFrame(stage_rows), hide_index=True, use_container_width=True)
+    if cache_rows:
+        st.dataframe(pd.DataFrame(cache_rows), hide_index=True, use_container_width=True)
+    if st.button("🧹 캐시 비우기", use_container_width=True):
+        clear_caches()
+        st.rerun()
@@ -0,0 +1,218 @@
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from fetcher import fetch_many
+from ohlcv_cache import OhlcvCache
+from signals import panel_rsi
+from universe import Universe
+
+# --- 백테스트: 탭1/탭2 매매 규칙을 (날짜 × 종목) 패널 전체에 벡터 연산으로 재생 + 파라미터 스윕 ---
+
+DEFAULTS = {'ma_short': 10, 'ma_long': 20, 'rsi_period': 14, 'rsi_hi': 75, 'rsi_lo': 30, 'vol_min': 0}
+HORIZONS = (1, 5, 10, 20)
+# 규칙 이름 -> 방향 (+1 매수 신호는 오르면 적중, -1 매도 신호는 내리면 적중)
+RULES = {
+    'day1': 1,        # 탭2: 골든크로스 + 이평선 위 + 하락 아님 (+ 거래량 비율 하한)
+    'golden': 1,      # 탭1 [강력 매수]: 골든크로스
+    'rsi_sell': -1,   # 탭1 [분할 매도]: RSI >= hi (골든크로스가 아닐 때)
+    'rsi_buy': 1,     # 탭1 [저점 매수]: RSI <= lo (위 두 경우가 아닐 때)
+}
+
+
+def load_panel(codes, years=5, cache=None):
+    # 디스크 캐시에서 읽어 날짜 합집합 기준으로 정렬 (거래정지일은 NaN -> 그 구간 신호는 자연히 꺼짐)
+    cache = cache or OhlcvCache(history_days=365 * years + 30)
+    start = (datetime.now() - timedelta(days=365 * years)).strftime('%Y-%m-%d')
+    frames = {c: df for c, df, err in fetch_many(codes, start, reader=cache.read, rate=None) if err is None and len(df)}
+    cache.flush()
+    codes = [c for c in codes if c in frames]
+    if not codes:
+        # 받은 종목이 없으면(--limit 0, 전부 수집 실패) pd.concat이 빈 dict에서 터지므로 빈 패널
+        empty = np.empty((0, 0))
+        return {'dates': pd.DatetimeIndex([]), 'codes': [], 'Open': empty, 'Close': empty.copy(), 'Volume': empty.copy()}
+    panel = {f: pd.concat({c: frames[c][f] for c in codes}, axis=1).sort_index() for f in ('Open', 'Close', 'Volume')}
+    return {'dates': panel['Close'].index, 'codes': codes,
+            **{f: panel[f].to_numpy(dtype=float) for f in ('Open', 'Close', 'Volume')}}
+
+
+def rolling_mean(a, window):
+    # 누적합 차분으로 창 평균 (창 안에 NaN이 있으면 NaN = rolling(window).mean()과 같은 규칙)
+    valid = ~np.isnan(a)
+    cs = np.vstack([np.zeros((1, a.shape[1])), np.cumsum(np.where(valid, a, 0.0), axis=0)])
+    cnt = np.vstack([np.zeros((1, a.shape[1])), np.cumsum(valid, axis=0)])
+    out = np.full(a.shape, np.nan)
+    if len(a) >= window:
+        full = (cnt[window:] - cnt[:-window]) == window
+        out[window - 1:] = np.where(full, (cs[window:] - cs[:-window]) / window, np.nan)
+    return out
+
+
+def _shift(a, n):
+    # n>0: 과거 값을 끌어옴, n<0: 미래 값을 끌어옴
+    out = np.full(a.shape, np.nan if a.dtype.kind == 'f' else False, dtype=a.dtype)
+    if n > 0:
+        out[n:] = a[:-n]
+    elif n < 0:
+        out[:n] = a[-n:]
+    else:
+        out[:] = a
+    return out
+
+
+class Replay:
+    # 같은 창/기간 지표는 파라미터 세트끼리 공유 (스윕에서 재계산 방지)
+    def __init__(self, panel):
+        self.p = panel
+        self._memo = {}
+
+    def _get(self, key, fn):
+        if key not in self._memo:
+            self._memo[key] = fn()
+        return self._memo[key]
+
+    def ma(self, w):
+        return self._get(('ma', w), lambda: rolling_mean(self.p['Close'], w))
+
+    def rsi(self, period):
+        return self._get(('rsi', period), lambda: panel_rsi(self.p['Close'], period))
+
+    def vol_ratio(self):
+        def calc():
+            prev5 = _shift(rolling_mean(self.p['Volume'], 5), 1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(prev5 > 0, self.p['Volume'] / prev5 * 100, 0.0)
+        return self._get(('vol',), calc)
+
+    def fwd(self, n):
+        c = self.p['Close']
+        return self._get(('fwd', n), lambda: _shift(c, -n) / c - 1)
+
+    def daily(self):
+        c = self.p['Close']
+        return self._get(('daily',), lambda: c / _shift(c, 1) - 1)
+
+    def signals(self, params):
+        q = {**DEFAULTS, **params}
+        c, o = self.p['Close'], self.p['Open']
+        s, l = self.ma(q['ma_short']), self.ma(q['ma_long'])
+        cross = (_shift(s, 1) <= _shift(l, 1)) & (s > l)
+        above = (c > s) & (c > l)
+        not_falling = (c >= _shift(c, 1)) | (c >= o)
+        rsi = self.rsi(q['rsi_period'])
+        hot = (rsi >= q['rsi_hi']) & ~cross
+        return {
+            'day1': cross & above & not_falling & (self.vol_ratio() >= q['vol_min']),
+            'golden': cross,
+            'rsi_sell': hot,
+            'rsi_buy': (rsi <= q['rsi_lo']) & ~cross & ~hot,
+        }
+
+    def metrics(self, sig, direction, horizon):
+        fwd = self.fwd(horizon) * direction
+        trades = sig & ~np.isnan(fwd)
+        n = int(trades.sum())
+        rets = fwd[trades]
+        # 포트폴리오: 신호 다음 날부터 horizon일 보유, 보유 종목 동일 가중
+        cs = np.cumsum(np.vstack([np.zeros((1, sig.shape[1]), dtype=int), sig.astype(int)]), axis=0)
+        held = (cs[:-1] - np.vstack([np.zeros((horizon, sig.shape[1]), dtype=int), cs[:-1 - horizon]])) > 0
+        day = np.where(held, self.daily() * direction, np.nan)
+        count = held.sum(axis=1)
+        with np.errstate(invalid='ignore'):
+            port = np.where(count > 0, np.nansum(day, axis=1) / np.maximum(count, 1), 0.0)
+        equity = np.cumprod(1 + port)
+        drawdown = 1 - equity / np.maximum.accumulate(equity)
+        # 회전율: 하루 편입+편출 종목 수 / (전날 보유 + 오늘 보유) = 변경 수를 두 날 평균 보유 수의 2배로 나눈 값
+        # (장부 전체가 바뀌는 날이 1.0, 보유가 있었던 날만 평균)
+        changes = (held ^ _shift(held, 1)).sum(axis=1)
+        book = count + np.concatenate([[0], count[:-1]])
+        active = book > 0
+        return {
+            'trades': n,
+            'hit_rate': float((rets > 0).mean()) if n else np.nan,
+            'avg_ret': float(rets.mean()) if n else np.nan,
+            'med_ret': float(np.median(rets)) if n else np.nan,
+            'total_ret': float(equity[-1] - 1) if len(equity) else np.nan,
+            'max_dd': float(drawdown.max()) if len(drawdown) else np.nan,
+            'turnover': float((changes[active] / book[active]).mean()) if active.any() else 0.0,
+        }
+
+    def run(self, params=None, horizons=HORIZONS, rules=tuple(RULES)):
+        sigs = self.signals(params or {})
+        return [{'rule': r, 'horizon': h, **self.metrics(sigs[r], RULES[r], h)} for r in rules for h in horizons]
+
+
+def backtest(panel, params=None, horizons=HORIZONS):
+    return pd.DataFrame(Replay(panel).run(params, horizons))
+
+
+# --- 파라미터 스윕: 패널은 워커 초기화 때 한 번만 넘기고, 워커마다 지표 메모를 공유 ---
+_worker = {}
+
+def _init_worker(panel):
+    _worker['replay'] = Replay(panel)
+
+
+def _sweep_chunk(chunk, horizons, rules):
+    replay = _worker['replay']
+    return [{**params, **row} for params in chunk for row in replay.run(params, horizons, rules)]
+
+
+def grid(**axes):
+    keys = list(axes)
+    return [dict(zip(keys, values)) for values in itertools.product(*axes.values())]
+
+
+def sweep(panel, param_sets, horizons=(5,), rules=('day1',), workers=None, chunk=20):
+    workers = workers or os.cpu_count() or 1
+    # 같은 창 길이끼리 한 워커에 몰아야 메모가 잘 맞는다
+    param_sets = sorted(param_sets, key=lambda p: tuple(sorted(p.items())))
+    chunks = [param_sets[i:i + chunk] for i in range(0, len(param_sets), chunk)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(panel,)) as pool:
+        parts = pool.map(_sweep_chunk, chunks, itertools.repeat(horizons), itertools.repeat(rules))
+        return pd.DataFrame([row for part in parts for row in part])
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="골든크로스/RSI 규칙 백테스트")
+    p.add_argument('--years', type=int, default=5)
+    p.add_argument('--limit', type=int, default=None, help="앞에서부터 N종목만")
+    p.add_argument('--horizons', type=int, nargs='+', default=list(HORIZONS))
+    p.add_argument('--sweep', action='store_true', help="MA 창 / RSI 기간·임계값 / 거래량 비율 그리드 스윕")
+    p.add_argument('--workers', type=int, default=None)
+    p.add_argument('--out', default=None, help="결과 CSV 경로")
+    args = p.parse_args(argv)
+
+    t0 = time.perf_counter()
+    codes = Universe.load().codes[:args.limit]
+    panel = load_panel(codes, args.years)
+    print(f"패널 {len(panel['dates'])}일 × {len(panel['codes'])}종목 ({time.perf_counter() - t0:.1f}s)")
+    if not panel['codes']:
+        print("불러온 종목이 없습니다 (--limit 또는 네트워크/캐시 상태를 확인하세요)", file=sys.stderr)
+        return 1
+
+    t0 = time.perf_counter()
+    if args.sweep:
+        params = grid(ma_short=[5, 10, 15, 20], ma_long=[20, 40, 60, 120], rsi_period=[9, 14, 21],
+                      rsi_hi=[70, 75, 80], rsi_lo=[25, 30], vol_min=[0, 100, 150])
+        params = [q for q in params if q['ma_short'] < q['ma_long']]
+        result = sweep(panel, params, tuple(args.horizons), tuple(RULES), args.workers)
+        top = result[result['rule'] == 'day1'].sort_values('avg_ret', ascending=False).head(10)
+        print(top.to_string(index=False))
+    else:
+        result = backtest(panel, horizons=args.horizons)
+        print(result.to_string(index=False))
+    print(f"{len(result)}행, {time.perf_counter() - t0:.1f}s")
+    if args.out:
+        result.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, time as dtime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+import krx_calendar as cal
+import perf
+from cards import buy_card
+from charts import price_figure, to_spec
+from fetcher import RateLimiter
+from investor import InvestorClient
+from ohlcv_cache import OhlcvCache
+from scanner import scan
+from signals import add_indicators
+
+# --- 오프라인 벤치마크: 녹화한 픽스처 + 로컬 가짜 데이터 소스로 탭1/탭2 파이프라인을 단계별로 계측 ---
+# python bench.py                                   -> 50 / 500종목 빠른 회귀 점검 (1 CPU 약 1.5분), 결과 JSON은 benchmarks/
+# python bench.py --full                            -> 50 / 500 / 5000종목 (1 CPU 약 11분)
+# python bench.py --compare benchmarks/이전.json    -> 단계별 소요 시간이 허용치 넘게 늘면 종료 코드 1
+# python bench.py --record 50                       -> (네트워크 필요) 실제 일봉/수급 응답을 픽스처로 녹화
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BASE_DIR, "data", "fixtures")
+BENCH_DIR = os.path.join(BASE_DIR, "benchmarks")
+SIZES = (50, 500)
+FULL_SIZES = (50, 500, 5000)
+# 앱 단계 이름(perf.stage) -> 결과 JSON 단계 키
+SCAN_STAGES = {'스캔 수집': 'tab2.fetch', '스캔 판정': 'tab2.signals'}
+
+
+# --- 픽스처 ---
+def record(codes, path=FIXTURE_DIR, years=6):
+    # 네트워크가 되는 곳에서 한 번: 실제 일봉(fdr)과 수급 API 응답 원문을 그대로 저장
+    import FinanceDataReader as fdr
+    import requests
+    from investor import NAVER_API
+    os.makedirs(path, exist_ok=True)
+    start = (datetime.now() - timedelta(days=365 * years)).strftime('%Y-%m-%d')
+    frames = {c: fdr.DataReader(c, start)[['Open', 'High', 'Low', 'Close', 'Volume', 'Change']] for c in codes}
+    pd.concat(frames, names=['Code', 'Date']).to_parquet(os.path.join(path, "ohlcv.parquet"))
+    flows = {c: requests.get(f"{NAVER_API}/{c}/investor", headers={'User-Agent': 'Mozilla/5.0'}, timeout=10).json()
+             for c in codes}
+    with open(os.path.join(path, "investor.json"), 'w', encoding='utf-8') as f:
+        json.dump(flows, f, ensure_ascii=False)
+    return len(frames)
+
+
+def synthetic_fixtures(n=50, bars=1500, end='2026-10-16', seed=0):
+    # 녹화본이 없을 때 쓰는 같은 모양의 합성 데이터 (결정적: 같은 seed면 같은 결과)
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(end=end, periods=bars, name='Date')
+    frames, flows = [], []
+    for _ in range(n):
+        close = np.round(rng.uniform(1000, 100000) * np.exp(np.cumsum(rng.normal(0, 0.02, bars))))
+        open_ = np.round(close * (1 + rng.normal(0, 0.01, bars)))
+        df = pd.DataFrame({'Open': open_, 'High': np.maximum(open_, close) * 1.01, 'Low': np.minimum(open_, close) * 0.99,
+                           'Close': close, 'Volume': rng.integers(1000, 1000000, bars).astype(float)}, index=idx)
+        df['Change'] = df['Close'].pct_change()
+        frames.append(df)
+        flows.append({'result': [{'bizdate': d.strftime('%Y%m%d'), 'institutionNetBuyVolume': f"{rng.integers(-50000, 50000):,}",
+                                  'foreignNetBuyVolume': f"{rng.integers(-50000, 50000):,}"} for d in idx[::-1][:20]]})
+    return frames, flows
+
+
+def load_fixtures(path=FIXTURE_DIR):
+    # -> (일봉 리스트, 수급 응답 리스트, 출처)
+    ohlcv = os.path.join(path, "ohlcv.parquet")
+    if not os.path.exists(ohlcv):
+        return (*synthetic_fixtures(), 'synthetic')
+    df = pd.read_parquet(ohlcv)
+    frames = [g.droplevel('Code') for _, g in df.groupby(level='Code')]
+    with open(os.path.join(path, "investor.json"), encoding='utf-8') as f:
+        flows = list(json.load(f).values())
+    return frames, flows, 'recorded'
+
+
+# --- 로컬 가짜 데이터 소스 ---
+class FakeSource:
+    # 픽스처를 종목코드에 돌려가며 배정. latency 로 네트워크 왕복 시간을 흉내 낸다
+    def __init__(self, frames, flows, latency=0.0):
+        self.frames, self.flows, self.latency = frames, flows, latency
+        self.last_date = max(df.index[-1] for df in frames)
+
+    def _pick(self, code, items):
+        return items[int(code) % len(items)]
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def clock(self):
+        # 픽스처 마지막 거래일 장 마감 후 -> 디스크 캐시가 그 뒤로 신선하게 유지된다
+        return datetime.combine(self.last_date.date(), dtime(18), tzinfo=cal.KST)
+
+    def reader(self, code, start=None, end=None):
+        # ohlcv_cache.naver_full_reader 자리
+        self._wait()
+        return self._pick(code, self.frames).loc[start:end].copy(), 0
+
+    def tail_reader(self, code, count, timeout=10):
+        # ohlcv_cache.naver_tail_reader 자리
+        self._wait()
+        return self._pick(code, self.frames).tail(count).copy(), 0
+
+    def serve(self):
+        # 수급 API 흉내: http://127.0.0.1:<port>/<code>/investor -> 녹화한 응답 원문 (keep-alive 유지)
+        source = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                source._wait()
+                body = json.dumps(source._pick(self.path.strip('/').split('/')[0], source.flows)).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, f"http://127.0.0.1:{server.server_port}"
+
+
+# --- 계측 ---
+def _timed(fn, samples):
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - t0)
+    return wrapper
+
+
+def _one_pass(source, cache, client, items, tab1_codes, investor_codes, legacy):
+    # 탭2(배치 스캔) + 탭1(단일 종목) 한 바퀴 -> {단계: (초, 항목별 지연 리스트, 항목 수)}
+    timer = perf.current()
+    timer.reset_stages()
+    out = {}
+    codes = [c for _, c in items]
+
+    # 빈 캐시(전부 원본 조회 + Parquet 저장) -> 채워진 캐시 순서로 같은 스캔을 두 번
+    cache.invalidate()
+    latency = []
+    cache.read = _timed(cache.read, latency)
+    scan(items, cache=cache, client=None)
+    out['tab2.fetch_cold'] = (timer.stages['스캔 수집'], latency[:], len(codes))
+    cold_peak = timer.peaks.get('스캔 수집')
+    timer.reset_stages()
+    latency.clear()
+    table, _ = scan(items, cache=cache, client=None)
+    del cache.read
+    for name, key in SCAN_STAGES.items():
+        out[key] = (timer.stages.pop(name), latency[:] if key == 'tab2.fetch' else [], len(codes))
+        if name in timer.peaks:
+            timer.peaks[key] = timer.peaks.pop(name)
+    if cold_peak is not None:
+        timer.peaks['tab2.fetch_cold'] = cold_peak
+
+    # 신호 종목만 조회하는 실제 흐름과 달리 고정 개수를 조회해야 규모별 비교가 된다
+    client.clear()
+    latency = []
+    client.get = _timed(client.get, latency)
+    with timer.stage('tab2.investor'):
+        client.get_many(investor_codes)
+    del client.get
+    out['tab2.investor'] = (timer.stages['tab2.investor'], latency, len(investor_codes))
+
+    if legacy:
+        # 예전 앱 경로: 종목마다 pandas rolling/ewm (calculate_rsi)
+        start = (source.clock() - timedelta(days=60)).strftime('%Y-%m-%d')
+        frames = [cache.read(c, start) for c in codes]
+        latency = []
+        indicators = _timed(add_indicators, latency)
+        with timer.stage('tab2.legacy_indicators'):
+            for df in frames:
+                indicators(df)
+        out['tab2.legacy_indicators'] = (timer.stages['tab2.legacy_indicators'], latency, len(frames))
+
+    rows = table.to_dict('records')
+    latency = []
+    card = _timed(buy_card, latency)
+    with timer.stage('tab2.render'):
+        for r in rows:
+            card(r)
+    out['tab2.render'] = (timer.stages['tab2.render'], latency, len(rows))
+
+    start = (source.clock() - timedelta(days=365)).strftime('%Y-%m-%d')
+    steps = {'tab1.history': [], 'tab1.indicators': [], 'tab1.chart': []}
+    read = _timed(cache.read, steps['tab1.history'])
+    indicators = _timed(add_indicators, steps['tab1.indicators'])
+    chart = _timed(lambda df: to_spec(price_figure(df)), steps['tab1.chart'])
+    for code in tab1_codes:
+        with timer.stage('tab1.history'):
+            df = read(code, start)
+        with timer.stage('tab1.indicators'):
+            df = indicators(df)
+        with timer.stage('tab1.chart'):
+            chart(df)
+    for key, latency in steps.items():
+        out[key] = (timer.stages[key], latency, len(tab1_codes))
+    return out
+
+
+def run_size(source, n, repeats=3, memory=True, tab1=100, investor=500, legacy=True):
+    items = [(f"종목{i}", f"{i:06d}") for i in range(n)]
+    tab1_codes = [c for _, c in items[:tab1]]
+    investor_codes = [c for _, c in items[:investor]]
+    timer = perf.activate(perf.StageTimer())
+    server, base_url = source.serve()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = OhlcvCache(path=tmp, max_bytes=float('inf'), full_reader=source.reader, tail_reader=source.tail_reader,
+                               clock=source.clock, limiter=RateLimiter(float('inf')))
+            client = InvestorClient(base_url, clock=source.clock)
+            args = (source, cache, client, items, tab1_codes, investor_codes, legacy)
+            passes = [_one_pass(*args) for _ in range(repeats)]
+            peaks = {}
+            if memory:
+                # 메모리는 별도 한 바퀴 (tracemalloc 이 켜지면 느려지므로 시간 측정과 섞지 않는다)
+                tracemalloc.start()
+                try:
+                    _one_pass(*args)
+                    peaks = dict(timer.peaks)
+                finally:
+                    tracemalloc.stop()
+    finally:
+        server.shutdown()
+        server.server_close()
+        perf.activate(None)
+
+    results = []
+    for stage in passes[0]:
+        seconds = [p[stage][0] for p in passes]
+        latency = np.concatenate([p[stage][1] for p in passes]) if passes[0][stage][1] else np.array(seconds)
+        items_n = passes[0][stage][2]
+        total = float(np.median(seconds))
+        results.append({
+            'size': n, 'stage': stage, 'items': items_n, 'seconds': round(total, 4),
+            'throughput': round(items_n / total, 1) if total else None,
+            'p50_ms': round(float(np.percentile(latency, 50)) * 1000, 3),
+            'p95_ms': round(float(np.percentile(latency, 95)) * 1000, 3),
+            'peak_mb': round(peaks[stage] / 1024 ** 2, 2) if stage in peaks else None,
+        })
+    return results
+
+
+def _meta(fixtures, latency, repeats):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'created': datetime.now().isoformat(timespec='seconds'), 'fixtures': fixtures,
+            'latency_ms': latency * 1000, 'repeats': repeats, 'python': platform.python_version(),
+            'pandas': pd.__version__, 'numpy': np.__version__, 'cpus': os.cpu_count(), 'machine': platform.machine()}
+
+
+def _max_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / 1024 ** (2 if sys.platform == 'darwin' else 1), 1)
+
+
+def compare(prev, cur, tolerance=0.25):
+    # 같은 (규모, 단계)끼리 중앙값 소요 시간 비교 -> 허용치를 넘게 느려진 항목 리스트
+    before = {(r['size'], r['stage']): r for r in prev['results']}
+    regressions = []
+    for r in cur['results']:
+        old = before.get((r['size'], r['stage']))
+        if old and old['seconds'] and r['seconds'] / old['seconds'] > 1 + tolerance:
+            regressions.append({**r, 'before': old['seconds'], 'ratio': round(r['seconds'] / old['seconds'], 2)})
+    return regressions
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="오프라인 탭1/탭2 파이프라인 벤치마크")
+    p.add_argument('--sizes', type=int, nargs='+', default=None, help="유니버스 크기(종목 수, 기본 50 500)")
+    p.add_argument('--full', action='store_true', help="5000종목까지 (--sizes 50 500 5000)")
+    p.add_argument('--repeats', type=int, default=3, help="규모마다 반복 횟수 (소요 시간은 중앙값)")
+    p.add_argument('--latency', type=float, default=0.0, help="가짜 데이터 소스 왕복 지연(ms)")
+    p.add_argument('--tab1', type=int, default=20, help="탭1 단계를 잴 종목 수")
+    p.add_argument('--investor', type=int, default=500, help="수급 조회를 잴 종목 수")
+    p.add_argument('--no-legacy', action='store_true', help="종목별 pandas 지표(예전 경로) 측정 생략")
+    p.add_argument('--no-memory', action='store_true', help="tracemalloc 최대 메모리 측정 생략")
+    p.add_argument('--out', default=None, help="결과 JSON 경로 (기본: benchmarks/<시각>-<커밋>.json)")
+    p.add_argument('--compare', default=None, help="이전 결과 JSON과 비교")
+    p.add_argument('--tolerance', type=float, default=0.25, help="회귀로 볼 소요 시간 증가 비율")
+    p.add_argument('--record', type=int, default=None, help="유니버스 앞 N종목을 실제 데이터로 픽스처 녹화 (네트워크 필요)")
+    args = p.parse_args(argv)
+
+    if args.record:
+        from universe import Universe
+        print(f"{record(Universe.load().codes[:args.record])}종목 녹화: {FIXTURE_DIR}")
+        return 0
+
+    frames, flows, kind = load_fixtures()
+    source = FakeSource(frames, flows, args.latency / 1000)
+    print(f"픽스처 {len(frames)}종목 ({kind}), 지연 {args.latency:g}ms")
+    results = []
+    sizes = args.sizes or (FULL_SIZES if args.full else SIZES)
+    for n in sizes:
+        t0 = time.perf_counter()
+        results += run_size(source, n, args.repeats, not args.no_memory, min(args.tab1, n), min(args.investor, n),
+                            not args.no_legacy)
+        print(f"{n}종목 완료 ({time.perf_counter() - t0:.1f}s)")
+    report = {'meta': {**_meta(kind, args.latency / 1000, args.repeats), 'max_rss_mb': _max_rss_mb()}, 'results': results}
+    print(pd.DataFrame(results).to_string(index=False))
+
+    out = args.out or os.path.join(BENCH_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{report['meta']['commit'] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    print(f"-> {out}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(json.load(f), report, args.tolerance)
+        for r in regressions:
+            print(f"[회귀] {r['size']}종목 {r['stage']}: {r['before']}s -> {r['seconds']}s (x{r['ratio']})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
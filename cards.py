@@ -0,0 +1,33 @@
+import pandas as pd
+
+# --- 탭2 매수 추천 카드 HTML (앱과 벤치마크가 같은 마크업을 쓰도록 분리) ---
+
+
+def supply_html(r):
+    if not pd.isna(r['flow_err']):
+        return f"<b>수급 조회 실패</b> ({r['flow_err'][:40]})"
+    if pd.isna(r['inst']):
+        return "<b>수급 정보 없음</b>"
+    return (f"<b>기관 수급:</b> <span style=\"color:{'#ef4444' if r['inst']>0 else '#3b82f6'}\">{r['inst']:,}</span> 주 | "
+            f"<b>외인 수급:</b> <span style=\"color:{'#ef4444' if r['frgn']>0 else '#3b82f6'}\">{r['frgn']:,}</span> 주 | "
+            f"<b>5일 합계:</b> {r['flow5']:+,} 주")
+
+
+def buy_card(r):
+    # r: 스캔 결과 한 행 (dict)
+    return f"""
+    <div class="buy-card">
+        <div style="display:flex; justify-content:space-between; align-items:center;">
+            <b style="font-size:1.2rem; color:#111827;">{r['name']}</b>
+            <b style="color:#2563eb; font-size:1.1rem;">{r['price']:,.0f} 원</b>
+        </div>
+        <div class="indicator-container">
+            <div class="badge-premium">오늘 골든크로스 ✅</div>
+            <div class="badge-premium">거래량 {r['vol']:.0f}% 🔥</div>
+            <div class="badge-premium">RSI {r['rsi']:.1f} 🌡️</div>
+        </div>
+        <div class="supply-row">
+            {supply_html(r)}
+        </div>
+    </div>
+    """
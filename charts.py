@@ -0,0 +1,95 @@
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.subplots import make_subplots
+
+# --- 차트 파이프라인: 화면 폭에 맞춘 서버측 다운샘플링 (캔들 = 구간 OHLC 집계, 선 = LTTB) + 큰 시리즈는 WebGL ---
+# 그리는 점 수가 화면 폭에 묶이므로 10년 일봉이든 하루치 분봉이든 페이로드 크기가 일정하다
+
+CHART_WIDTH = 700       # layout="centered" 본문 폭(px)
+CANDLE_PX = 4           # 캔들 하나에 필요한 최소 폭 -> 캔들 수 상한 = 폭 / 4
+GL_POINTS = 1000        # 한 차트에 그리는 점이 이보다 많으면 Scattergl
+RANGES = {'3개월': 92, '1년': 365, '3년': 365 * 3, '5년': 365 * 5, '10년': 365 * 10}
+UP, DOWN = '#ef4444', '#3b82f6'
+
+
+def lttb(x, y, n):
+    # Largest-Triangle-Three-Buckets: 모양(꼭짓점)을 살리면서 n개 인덱스만 고른다 (처음/끝 점은 항상 포함)
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    out = np.empty(n, dtype=int)
+    out[0], out[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # 다음 구간 평균점 (마지막 구간은 끝 점)
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (size - 1, size)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def bucket_ohlc(df, n):
+    # 연속 n개 구간으로 묶어 시가=첫 값, 고가=최대, 저가=최소, 종가=마지막, 거래량=합 (min/max 솎아내기)
+    # 나머지 열(이평선/RSI 등)은 종가와 같은 시점 = 구간 마지막 값
+    if len(df) <= n:
+        return df
+    starts = np.linspace(0, len(df), n + 1).astype(int)[:-1]
+    ends = np.append(starts[1:], len(df)) - 1
+    out = df.iloc[ends].copy()
+    out['Open'] = df['Open'].to_numpy()[starts]
+    out['High'] = np.maximum.reduceat(df['High'].to_numpy(), starts)
+    out['Low'] = np.minimum.reduceat(df['Low'].to_numpy(), starts)
+    out['Volume'] = np.add.reduceat(df['Volume'].to_numpy(), starts)
+    return out
+
+
+def _line(n_points):
+    return go.Scattergl if n_points > GL_POINTS else go.Scatter
+
+
+def price_figure(df, width=CHART_WIDTH):
+    # 캔들 + 10/20 이평선 + 거래량. 입력은 add_indicators 를 거친 원본 해상도 프레임
+    df = bucket_ohlc(df, max(width // CANDLE_PX, 20))
+    line = _line(2 * len(df))
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.06, row_heights=[0.7, 0.3])
+    fig.add_trace(go.Candlestick(x=df.index, open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'], name='Price',
+                                 increasing=dict(line=dict(color=UP), fillcolor=UP),
+                                 decreasing=dict(line=dict(color=DOWN), fillcolor=DOWN)), row=1, col=1)
+    fig.add_trace(line(x=df.index, y=df['MA10'], name='10MA', line=dict(color='#111827', width=1.5, dash='dot')), row=1, col=1)
+    fig.add_trace(line(x=df.index, y=df['MA20'], name='20MA', line=dict(color='#f59e0b', width=1.5)), row=1, col=1)
+    fig.add_trace(go.Bar(x=df.index, y=df['Volume'], name='Vol', marker_color='#e5e7eb'), row=2, col=1)
+    fig.update_layout(template="plotly_white", height=500, margin=dict(l=0, r=0, t=10, b=0), showlegend=False,
+                      hovermode="x unified", xaxis_rangeslider_visible=False)
+    return fig
+
+
+def compare_figure(closes, width=CHART_WIDTH):
+    # closes: {이름: 종가 Series} -> 첫 거래일 대비 누적 수익률(%) 선, 종목마다 LTTB로 폭만큼만
+    series = {}
+    for label, close in closes.items():
+        close = close.dropna()
+        if len(close) < 2:
+            continue
+        idx = lttb(close.index.asi8, close.to_numpy(), width)
+        series[label] = (close.iloc[idx] / close.iloc[0] - 1) * 100
+    line = _line(sum(len(s) for s in series.values()))
+    fig = go.Figure([line(x=s.index, y=s, name=label, mode='lines') for label, s in series.items()])
+    fig.update_layout(template="plotly_white", height=400, margin=dict(l=0, r=0, t=10, b=0), hovermode="x unified",
+                      yaxis_ticksuffix='%', legend=dict(orientation='h', y=1.08))
+    return fig
+
+
+def to_spec(fig):
+    # 캐시에는 Figure 객체 대신 직렬화한 JSON 문자열을 넣는다 (피클/복사 비용이 작고 크기가 그대로 페이로드)
+    return pio.to_json(fig, validate=False)
+
+
+def from_spec(spec):
+    return pio.from_json(spec, skip_invalid=True)
@@ -0,0 +1,103 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import FinanceDataReader as fdr
+
+# --- 동시 수집 엔진: 스레드풀 + 호스트별 속도 제한 + 재시도/백오프 + 요청별 타임아웃 ---
+
+class RateLimiter:
+    # 토큰 버킷: 초당 rate 개, 최대 burst 개까지 몰아서 허용
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_LIMITERS = {}
+_LIMITERS_LOCK = threading.Lock()
+
+def get_limiter(host, rate, burst=None):
+    # 같은 호스트를 쓰는 모든 호출이 하나의 버킷을 공유
+    with _LIMITERS_LOCK:
+        if host not in _LIMITERS:
+            _LIMITERS[host] = RateLimiter(rate, burst)
+        return _LIMITERS[host]
+
+
+class FetchError(Exception):
+    def __init__(self, code, cause, attempts):
+        super().__init__(f"{code}: {cause!r} (시도 {attempts}회)")
+        self.code, self.cause, self.attempts = code, cause, attempts
+
+
+def _call_with_timeout(fn, args, timeout, name=None):
+    # 시도마다 새 데몬 스레드에서 호출 -> 타임아웃 시계는 호출이 실제로 시작될 때부터 돌고,
+    # 멈춘 호출은 스레드를 강제로 죽일 수 없으니 버려 두되 다음 시도의 자리를 차지하지 않는다
+    box = {}
+
+    def run():
+        try:
+            box['value'] = fn(*args)
+        except BaseException as e:
+            box['error'] = e
+
+    t = threading.Thread(target=run, name=name, daemon=True)
+    t.start()
+    t.join(timeout)
+    if t.is_alive():
+        raise TimeoutError(f"{timeout}s 초과")
+    if 'error' in box:
+        raise box['error']
+    return box['value']
+
+
+def fetch_many(codes, start, reader=None, max_workers=16, host="fdr", rate=20, burst=None,
+               retries=3, backoff=0.5, timeout=15):
+    # 완료되는 순서대로 (code, df, error) 를 내보냄 -> 호출 쪽에서 진행바를 바로 갱신 가능
+    reader = reader or fdr.DataReader
+    # rate=None: 속도 제한을 reader 쪽(예: OhlcvCache의 네트워크 경로)에 맡긴다 -> 캐시 적중은 기다리지 않음
+    limiter = get_limiter(host, rate, burst) if rate else None
+    codes = list(codes)
+    if not codes:
+        return
+
+    def fetch_one(code):
+        last = None
+        for attempt in range(1, retries + 1):
+            if limiter:
+                limiter.acquire()
+            try:
+                return _call_with_timeout(reader, (code, start), timeout, name=f"{host}-call-{code}")
+            except Exception as e:
+                last = e
+            if attempt < retries:
+                time.sleep(backoff * (2 ** (attempt - 1)) * (1 + random.random() * 0.25))
+        raise FetchError(code, last, retries)
+
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{host}-fetch")
+    try:
+        futures = {pool.submit(fetch_one, c): c for c in codes}
+        for fut in as_completed(futures):
+            code = futures[fut]
+            try:
+                yield code, fut.result(), None
+            except FetchError as e:
+                yield code, None, e
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
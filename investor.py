@@ -0,0 +1,96 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import krx_calendar as cal
+
+# --- 투자자별 수급 클라이언트: 커넥션 풀 세션 + 타임아웃 + 동시 조회 + 거래일 단위 TTL 캐시 ---
+
+NAVER_API = "https://m.stock.naver.com/api/stock"
+
+
+@dataclass(frozen=True)
+class InvestorFlow:
+    code: str
+    inst: int = 0
+    frgn: int = 0
+    history: tuple = ()          # 최신순 (날짜, 기관 순매수, 외인 순매수)
+    error: str = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def trend(self, days=5):
+        # 최근 N거래일 순매수 합계 (기관, 외인)
+        recent = self.history[:days]
+        return sum(h[1] for h in recent), sum(h[2] for h in recent)
+
+
+def _to_int(v):
+    return int(str(v).replace(',', '').replace('+', '') or 0)
+
+
+class InvestorClient:
+    def __init__(self, base_url=NAVER_API, timeout=(3.05, 5), max_workers=16, ttl=600, clock=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.clock = clock or cal.now_kst
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'Mozilla/5.0'})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def get(self, code):
+        # 같은 거래일 안에서는 TTL 동안 재사용 (거래일이 바뀌면 키가 달라져 자연히 무효화)
+        key = (code, cal.latest_session(self.clock()))
+        now = time.monotonic()
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit and hit[0] > now:
+                return hit[1]
+        flow = self._fetch(code)
+        if flow.ok:
+            with self._lock:
+                # 지난 거래일 항목은 다시 쓰일 일이 없으므로 넣을 때 같이 정리 (프로세스 수명 동안 무한히 커지지 않게)
+                for stale in [k for k in self._cache if k[1] != key[1]]:
+                    del self._cache[stale]
+                self._cache[key] = (now + self.ttl, flow)
+        return flow
+
+    def get_many(self, codes):
+        codes = list(dict.fromkeys(codes))
+        if not codes:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(codes))) as pool:
+            return dict(zip(codes, pool.map(self.get, codes)))
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _fetch(self, code):
+        try:
+            res = self.session.get(f"{self.base_url}/{code}/investor", timeout=self.timeout)
+            res.raise_for_status()
+            rows = res.json()['result']
+            history = tuple((r.get('bizdate'), _to_int(r['institutionNetBuyVolume']), _to_int(r['foreignNetBuyVolume']))
+                            for r in rows)
+        except requests.Timeout:
+            return InvestorFlow(code, error="timeout")
+        except (ValueError, KeyError, TypeError) as e:
+            return InvestorFlow(code, error=f"parse: {e!r}")
+        except requests.RequestException as e:
+            return InvestorFlow(code, error=f"http: {e}")
+        if not history:
+            return InvestorFlow(code, error="empty")
+        return InvestorFlow(code, history[0][1], history[0][2], history)
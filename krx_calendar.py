@@ -0,0 +1,45 @@
+from datetime import datetime, time as dtime, timedelta, timezone
+
+# --- KRX 거래 달력: 주말 + (선택) 휴장일 + 정규장 시간 기준으로 "마지막 세션"을 계산 ---
+
+KST = timezone(timedelta(hours=9))
+MARKET_OPEN = dtime(9, 0)
+MARKET_CLOSE = dtime(15, 30)
+# 장 마감 후 일봉이 확정되어 데이터 소스에 반영되기까지의 여유
+SETTLE_DELAY = timedelta(minutes=30)
+
+# 휴장일은 해마다 바뀌므로 하드코딩하지 않는다 -> 필요하면 set_holidays()로 주입
+# (빠져 있어도 휴장일에 증분 조회 1회가 빈 결과로 끝날 뿐 데이터가 틀어지지는 않음)
+_HOLIDAYS = set()
+
+def set_holidays(dates):
+    _HOLIDAYS.clear()
+    _HOLIDAYS.update(d if not isinstance(d, datetime) else d.date() for d in dates)
+
+def now_kst():
+    return datetime.now(KST)
+
+def is_trading_day(d):
+    return d.weekday() < 5 and d not in _HOLIDAYS
+
+def previous_trading_day(d):
+    d -= timedelta(days=1)
+    while not is_trading_day(d):
+        d -= timedelta(days=1)
+    return d
+
+def is_market_open(now=None):
+    now = now or now_kst()
+    return is_trading_day(now.date()) and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+def latest_session(now=None):
+    # 지금 시점에 데이터 소스에 존재할 수 있는 가장 최근 일봉 날짜 (장중이면 오늘의 미완성 봉)
+    now = now or now_kst()
+    today = now.date()
+    if is_trading_day(today) and now.time() >= MARKET_OPEN:
+        return today
+    return previous_trading_day(today)
+
+def session_settled_at(d):
+    # 해당 세션의 일봉이 더 이상 바뀌지 않는 시각
+    return datetime.combine(d, MARKET_CLOSE, KST) + SETTLE_DELAY
@@ -0,0 +1,259 @@
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+import requests
+
+import krx_calendar as cal
+from fetcher import get_limiter
+
+# --- 디스크 OHLCV 캐시: 종목별 Parquet + 증분 append + 거래 달력 기반 신선도 + LRU 용량 제한 ---
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "ohlcv")
+NAVER_RATE = 20  # 초당 요청 수 (full/증분 조회 공용)
+NAVER_CHART_URL = "https://fchart.stock.naver.com/sise.nhn?timeframe=day&requestType=0"
+FULL_COUNT = 6000  # fdr.DataReader(KRX 종목)가 같은 엔드포인트에 요청하는 봉 수
+
+_session = requests.Session()
+_session.headers.update({'User-Agent': 'Mozilla/5.0'})
+
+
+def naver_tail_reader(code, count, timeout=10):
+    # fdr.DataReader는 항상 6000봉을 받아오므로, 증분 조회는 같은 엔드포인트에서 필요한 봉 수만 요청
+    r = _session.get(f"{NAVER_CHART_URL}&count={int(count)}&symbol={code}", timeout=timeout)
+    r.raise_for_status()
+    rows = re.findall(r'<item data="(.*?)" />', r.text, re.DOTALL)
+    if not rows:
+        return pd.DataFrame(), len(r.content)
+    df = pd.read_csv(StringIO('\n'.join(rows)), delimiter='|', header=None, dtype={0: str})
+    df.columns = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+    df['Date'] = pd.to_datetime(df['Date'], format='%Y%m%d')
+    return df.set_index('Date').sort_index(), len(r.content)
+
+
+def naver_full_reader(code, start, timeout=10):
+    # fdr.DataReader와 같은 요청(6000봉)이지만 응답 바이트 수도 돌려줘서 채우기 비용을 증분과 같은 기준으로 잰다
+    df, nbytes = naver_tail_reader(code, FULL_COUNT, timeout)
+    if not df.empty:
+        df['Change'] = df['Close'].pct_change()
+    return df.loc[start:], nbytes
+
+
+class _FileLock:
+    # O_EXCL 잠금 파일 (fcntl이 없는 Windows에서도 동작). 죽은 프로세스가 남긴 잠금은 stale초 뒤 무시
+    def __init__(self, path, stale=10):
+        self.path, self.stale = path, stale
+
+    def __enter__(self):
+        while True:
+            try:
+                os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.stale:
+                        os.remove(self.path)
+                except OSError:
+                    pass
+                time.sleep(0.005)
+
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class OhlcvCache:
+    def __init__(self, path=CACHE_DIR, history_days=365 * 5, max_bytes=512 * 1024 ** 2, intraday_ttl=60,
+                 full_reader=None, tail_reader=None, clock=None, limiter=None, flush_interval=2.0):
+        self.path = path
+        self.history_days = history_days
+        self.max_bytes = max_bytes
+        self.intraday_ttl = intraday_ttl
+        self.flush_interval = flush_interval
+        self.full_reader = full_reader or naver_full_reader
+        self.tail_reader = tail_reader or naver_tail_reader
+        self.clock = clock or cal.now_kst
+        self.limiter = limiter or get_limiter("naver", NAVER_RATE)
+        self.stats = {'hits': 0, 'appends': 0, 'fills': 0, 'calls': 0, 'rows': 0, 'bytes': 0}
+        self._lock = threading.Lock()
+        self._code_locks = {}
+        self._dirty = set()
+        os.makedirs(path, exist_ok=True)
+        self._index_path = os.path.join(path, "_index.json")
+        self._index = self._read_index()
+        self._bytes = sum(m['bytes'] for m in self._index.values())
+        self._flushed = time.monotonic()
+
+    # --- 공개 API ---
+    def read(self, code, start):
+        start = pd.Timestamp(start)
+        with self._code_lock(code):
+            now = self.clock()
+            meta = self._index.get(code)
+            df = self._load(code) if meta else None
+            if df is None or start < pd.Timestamp(meta['since']):
+                df = self._fill(code, start, now)
+            elif not self._is_fresh(meta, now):
+                # since는 지금 읽어 둔다: 받아오는 동안 다른 스레드의 축출이 인덱스 항목을 지울 수 있다
+                df = self._append(code, df, now, pd.Timestamp(meta['since']))
+            else:
+                self._count('hits')
+            with self._lock:
+                if code in self._index:
+                    self._index[code]['last_access'] = time.time()
+        self._maybe_flush()
+        return df.loc[start:].copy()
+
+    def flush(self):
+        # 모아 둔 인덱스 변경을 디스크에 반영 (스캔 한 바퀴가 끝났을 때 등)
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def invalidate(self, code=None):
+        with self._lock:
+            codes = [code] if code else list(self._index)
+            for c in codes:
+                self._index.pop(c, None)
+                self._dirty.add(c)
+                try:
+                    os.remove(self._file(c))
+                except OSError:
+                    pass
+            self._save_index()
+
+    # --- 신선도: 마지막 세션 일봉이 확정된 뒤에 받은 데이터면 더 바뀔 게 없음 (주말/장 시작 전 포함) ---
+    def _is_fresh(self, meta, now):
+        fetched = datetime.fromisoformat(meta['fetched_at'])
+        session = cal.latest_session(now)
+        if fetched >= cal.session_settled_at(session):
+            return True
+        # 장중(또는 마감 직후 확정 전)의 미완성 봉은 짧은 TTL 동안만 재사용
+        return session == now.date() and (now - fetched).total_seconds() < self.intraday_ttl
+
+    # --- 네트워크 경로 ---
+    def _fill(self, code, start, now):
+        since = min(start, pd.Timestamp(now.date() - timedelta(days=self.history_days)))
+        self.limiter.acquire()
+        df, nbytes = self.full_reader(code, since.strftime('%Y-%m-%d'))
+        self._count('fills')
+        self._count('calls')
+        self._count('bytes', nbytes)
+        if df is None or df.empty:
+            return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume', 'Change'], index=pd.DatetimeIndex([], name='Date'))
+        self._count('rows', len(df))
+        self._store(code, df, now, since)
+        return df
+
+    def _append(self, code, df, now, since):
+        last = df.index[-1].date()
+        # 마지막 캐시 봉(미완성이었을 수 있음)부터 다시 받아 덮어쓴다
+        count = int(np.busday_count(last, cal.latest_session(now))) + 2
+        self.limiter.acquire()
+        new, nbytes = self.tail_reader(code, count)
+        self._count('appends')
+        self._count('calls')
+        self._count('rows', len(new))
+        self._count('bytes', nbytes)
+        if not new.empty:
+            df = pd.concat([df.drop(columns='Change', errors='ignore'), new])
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+            df['Change'] = df['Close'].pct_change()
+        self._store(code, df, now, since)
+        return df
+
+    # --- 저장소 ---
+    def _file(self, code):
+        return os.path.join(self.path, f"{code}.parquet")
+
+    def _load(self, code):
+        try:
+            return pd.read_parquet(self._file(code))
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, code, df, now, since):
+        df.to_parquet(self._file(code))
+        with self._lock:
+            self._dirty.add(code)
+            old = self._index.get(code)
+            self._index[code] = {
+                'since': since.strftime('%Y-%m-%d'),
+                'fetched_at': now.isoformat(),
+                'last_access': time.time(),
+                'bytes': os.path.getsize(self._file(code)),
+            }
+            self._bytes += self._index[code]['bytes'] - (old['bytes'] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict(keep=code)
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        # 저장할 때마다 인덱스 전체를 다시 읽고 쓰면 콜드 스캔이 종목 수의 제곱으로 느려진다 -> flush_interval초에 한 번만
+        # (그 사이 프로세스가 죽으면 인덱스에 없는 종목은 다음에 다시 받을 뿐 데이터가 틀어지지는 않음)
+        if self._dirty and time.monotonic() - self._flushed >= self.flush_interval:
+            self.flush()
+
+    def _evict(self, keep):
+        for c in sorted(self._index, key=lambda c: self._index[c]['last_access']):
+            if self._bytes <= self.max_bytes:
+                break
+            # 지금 읽거나 받아오는 중인 종목(잠금이 잡힌 종목)은 건너뛴다 -> 다음 저장 때 다시 기회가 있음
+            lock = self._code_locks.get(c)
+            if c == keep or (lock is not None and lock.locked()):
+                continue
+            self._bytes -= self._index.pop(c)['bytes']
+            self._dirty.add(c)
+            try:
+                os.remove(self._file(c))
+            except OSError:
+                pass
+
+    def _read_index(self):
+        try:
+            with open(self._index_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        # 배치 스캐너처럼 여러 프로세스가 같은 캐시를 쓰므로, 잠금 파일을 잡고 내가 바꾼 항목만 디스크 인덱스에 병합
+        with _FileLock(self._index_path + ".lock"):
+            disk = self._read_index()
+            for c in self._dirty:
+                if c in self._index:
+                    disk[c] = self._index[c]
+                else:
+                    disk.pop(c, None)
+            for c, m in disk.items():
+                if c in self._dirty:
+                    continue
+                # 캐시 적중은 dirty로 표시하지 않으므로, 내 쪽 접근 시각이 더 최근이면 살려서 같이 저장 (LRU 유지)
+                mine = self._index.get(c)
+                if mine is not None and mine['last_access'] > m['last_access']:
+                    m = disk[c] = {**m, 'last_access': mine['last_access']}
+                self._index[c] = m
+            self._dirty.clear()
+            tmp = f"{self._index_path}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(disk, f)
+            os.replace(tmp, self._index_path)
+        # 병합으로 다른 프로세스가 넣은 항목이 들어왔을 수 있으므로 용량 합계를 다시 센다
+        self._bytes = sum(m['bytes'] for m in self._index.values())
+        self._flushed = time.monotonic()
+
+    def _code_lock(self, code):
+        with self._lock:
+            return self._code_locks.setdefault(code, threading.Lock())
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self.stats[key] += n
@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+# --- 단계별 시간 / 캐시 적중 계측 (스트림릿 세션마다 스크립트가 자기 스레드에서 돌므로 스레드 로컬로 현재 계측기를 잡는다) ---
+
+_local = threading.local()
+# 운영 계측: 이 환경 변수에 경로를 주면 앱 리런/배치 스캔마다 단계별 시간을 JSONL로 남긴다
+LOG_PATH = os.environ.get('SON_PERF_LOG')
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages = {}                                        # 이번 실행: 단계 -> 누적 초
+        self.peaks = {}                                         # tracemalloc 켜져 있을 때만: 단계 -> 최대 추가 메모리(바이트)
+        self.cache = defaultdict(lambda: {'calls': 0, 'misses': 0})  # 세션 누적: 캐시 이름 -> 호출/미스
+
+    def reset_stages(self):
+        self.stages = {}
+        self.peaks = {}
+
+    @contextmanager
+    def stage(self, name):
+        # 메모리 최대치는 단계 시작 시점 대비 증가분 (단계를 중첩하면 안쪽 단계가 바깥쪽 최대치를 리셋하므로 겹치지 않게 쓴다)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - t0
+            if tracing:
+                self.peaks[name] = max(self.peaks.get(name, 0), tracemalloc.get_traced_memory()[1] - base)
+
+    def rows(self):
+        stages = [{'단계': k, 'ms': round(v * 1000, 1)} for k, v in self.stages.items()]
+        caches = [{'캐시': k, '호출': c['calls'], '적중': c['calls'] - c['misses'],
+                   '적중률': f"{(c['calls'] - c['misses']) / c['calls']:.0%}" if c['calls'] else '-'}
+                  for k, c in self.cache.items()]
+        return stages, caches
+
+    def dump(self, path=None, **fields):
+        path = path or LOG_PATH
+        if not path:
+            return
+        record = {'ts': time.time(), **fields, 'stages_ms': {k: round(v * 1000, 2) for k, v in self.stages.items()}}
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def activate(timer):
+    _local.timer = timer
+    return timer
+
+
+def current():
+    return getattr(_local, 'timer', None)
+
+
+@contextmanager
+def stage(name):
+    timer = current()
+    if timer is None:
+        yield
+    else:
+        with timer.stage(name):
+            yield
+
+
+def count_call(name):
+    timer = current()
+    if timer is not None:
+        timer.cache[name]['calls'] += 1
+
+
+def count_miss(name):
+    # 캐시된 함수 본문 안에서 호출 -> 본문이 실제로 실행된 횟수 = 미스
+    timer = current()
+    if timer is not None:
+        timer.cache[name]['misses'] += 1
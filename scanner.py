@@ -0,0 +1,241 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import perf
+from fetcher import RateLimiter, fetch_many
+from investor import InvestorClient
+from ohlcv_cache import OhlcvCache
+from signals import MIN_BARS, build_panel, scan_panel
+from universe import Universe
+
+# --- Day-1 스캔 파이프라인 (수집 -> 패널 판정 -> 수급) + 헤드리스 배치 CLI ---
+# 크론 예:  30 8,16 * * 1-5  cd /app && python scanner.py --workers 4
+
+SCAN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scans")
+LATEST = os.path.join(SCAN_DIR, "latest.parquet")
+EXTENSIONS = {'parquet': '.parquet', 'csv': '.csv', 'json': '.jsonl'}
+COLUMNS = {
+    'code': 'string', 'name': 'string', 'price': 'float64', 'ma10': 'float64', 'ma20': 'float64',
+    'rsi': 'float64', 'vol': 'float64', 'is_cross': 'bool', 'is_above_ma': 'bool', 'is_not_falling': 'bool',
+    'signal': 'bool', 'last_date': 'datetime64[ns]', 'inst': 'Int64', 'frgn': 'Int64', 'flow5': 'Int64',
+    'flow_err': 'string', 'error': 'string',
+}
+
+
+def _normalize(df):
+    # 배치마다 열/타입이 같아야 Parquet 행 그룹과 체크포인트가 그대로 이어 붙는다
+    df = df.reset_index() if 'code' not in df.columns else df
+    df = df.reindex(columns=list(COLUMNS))
+    for col in ('is_cross', 'is_above_ma', 'is_not_falling', 'signal'):
+        df[col] = df[col].fillna(False)
+    return df.astype(COLUMNS)
+
+
+def evaluate(frames, names, client=None):
+    # 패널 판정 + 신호 종목만 수급 조회. 봉이 모자란 종목도 행으로 남겨 재개 시 다시 받지 않게 한다
+    with perf.stage('스캔 판정'):
+        table = scan_panel(build_panel(frames))
+    table['name'] = [names.get(c, c) for c in table.index]
+    hits = table.index[table['signal']]
+    table[['inst', 'frgn', 'flow5', 'flow_err']] = None
+    if client is not None and len(hits):
+        with perf.stage('스캔 수급'):
+            flows = client.get_many(hits)
+        for code in hits:
+            f = flows[code]
+            # 조회 실패를 0(중립)으로 남기면 수급 추세순 정렬에서 실제 순매도 종목보다 위로 올라간다 -> 결측으로
+            if f.ok:
+                table.loc[code, ['inst', 'frgn', 'flow5']] = [f.inst, f.frgn, sum(f.trend(5))]
+            else:
+                table.loc[code, ['inst', 'frgn', 'flow5']] = pd.NA
+            table.loc[code, 'flow_err'] = f.error
+    short = [c for c, df in frames.items() if c not in table.index]
+    rows = _normalize(table)
+    if short:
+        rows = pd.concat([rows, _normalize(pd.DataFrame({
+            'code': short, 'name': [names.get(c, c) for c in short], 'error': f"bars<{MIN_BARS}"}))], ignore_index=True)
+    return rows
+
+
+def scan(items, days=60, cache=None, client=None, on_progress=None, **fetch_kw):
+    # items: [(name, code), ...] -> (결과 DataFrame, 수집 실패 [(code, 에러)])
+    names = {code: name for name, code in items}
+    start = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+    cache = cache or OhlcvCache()
+    frames, failed = {}, []
+    with perf.stage('스캔 수집'):
+        for i, (code, df, err) in enumerate(fetch_many(list(names), start, reader=cache.read, rate=None, **fetch_kw)):
+            if err:
+                failed.append((code, str(err)))
+            else:
+                frames[code] = df
+            if on_progress:
+                on_progress(i + 1, len(names))
+        cache.flush()
+    return evaluate(frames, names, client), failed
+
+
+def load_latest(path=LATEST):
+    # 앱이 여는 쪽: 가장 최근 배치 스캔 결과 (없으면 None)
+    if not os.path.exists(path):
+        return None
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    elif path.endswith('.csv'):
+        df = pd.read_csv(path, dtype={'code': str}, parse_dates=['last_date'])
+    else:
+        df = pd.read_json(path, lines=True, dtype={'code': str}, convert_dates=['last_date'])
+    return _normalize(df)
+
+
+def save(rows, path=LATEST):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    writer = _Writer(path + ".tmp", _format_of(path))
+    writer.write(rows)
+    writer.close()
+    os.replace(path + ".tmp", path)
+
+
+# --- 스트리밍 출력 ---
+def _format_of(path):
+    for fmt, ext in EXTENSIONS.items():
+        if path.endswith(ext):
+            return fmt
+    raise ValueError(f"지원하지 않는 출력 형식: {path}")
+
+
+class _Writer:
+    def __init__(self, path, fmt):
+        self.path, self.fmt = path, fmt
+        self._pq = None
+        if fmt != 'parquet':
+            open(path, 'w').close()
+        self._header = True
+
+    def write(self, rows):
+        if rows.empty:
+            return
+        if self.fmt == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(rows, preserve_index=False)
+            if self._pq is None:
+                self._pq = pq.ParquetWriter(self.path, table.schema)
+            self._pq.write_table(table.cast(self._pq.schema))
+        elif self.fmt == 'csv':
+            rows.to_csv(self.path, mode='a', header=self._header, index=False)
+        else:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(rows.to_json(orient='records', lines=True, date_format='iso', force_ascii=False) + '\n')
+        self._header = False
+
+    def close(self):
+        if self._pq is not None:
+            self._pq.close()
+        elif self.fmt == 'parquet':
+            # 결과가 하나도 없어도 읽을 수 있는 빈 파일을 남긴다
+            _normalize(pd.DataFrame(columns=list(COLUMNS))).to_parquet(self.path, index=False)
+
+
+# --- 프로세스 풀 워커: 프로세스마다 캐시/수급 클라이언트를 하나씩 ---
+_worker = {}
+
+def _init_worker(rate):
+    _worker['cache'] = OhlcvCache(limiter=RateLimiter(rate))
+    _worker['client'] = InvestorClient()
+    _worker['timer'] = perf.activate(perf.StageTimer())
+
+
+def _scan_batch(items, days):
+    # 배치별 단계 시간을 결과와 함께 돌려보내 부모 프로세스에서 합산
+    _worker['timer'].reset_stages()
+    rows, failed = scan(items, days, _worker['cache'], _worker['client'], max_workers=8)
+    return rows, failed, _worker['timer'].stages
+
+
+def run(items, out=LATEST, workers=None, batch=50, days=60, resume=False, rate=20, log=print):
+    fmt = _format_of(out)
+    ckpt = out + ".ckpt.jsonl"
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    writer = _Writer(out + ".tmp", fmt)
+
+    done = set()
+    if resume and os.path.exists(ckpt):
+        prev = pd.read_json(ckpt, lines=True, dtype={'code': str, 'name': str}, convert_dates=['last_date'])
+        if not prev.empty:
+            prev = _normalize(prev.drop_duplicates('code', keep='last'))
+            writer.write(prev)
+            done = set(prev['code'])
+        log(f"체크포인트에서 {len(done)}종목 복원")
+    else:
+        open(ckpt, 'w').close()
+
+    todo = [(n, c) for n, c in items if c not in done]
+    batches = [todo[i:i + batch] for i in range(0, len(todo), batch)]
+    workers = workers or os.cpu_count() or 1
+    # 속도 제한은 프로세스마다 따로 걸리므로 전체 한도를 나눠 준다 (캐시 적중은 한도와 무관)
+    per_process = max(1.0, rate / workers)
+    failed, stages, t0 = [], {}, time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(per_process,)) as pool:
+        futures = [pool.submit(_scan_batch, b, days) for b in batches]
+        for k, fut in enumerate(as_completed(futures), 1):
+            rows, batch_failed, batch_stages = fut.result()
+            failed += batch_failed
+            for name, sec in batch_stages.items():
+                stages[name] = stages.get(name, 0.0) + sec
+            # 체크포인트를 먼저 남긴 뒤 출력에 흘려보낸다 (중단돼도 --resume 으로 이어서)
+            with open(ckpt, 'a', encoding='utf-8') as f:
+                if not rows.empty:
+                    f.write(rows.to_json(orient='records', lines=True, date_format='iso', force_ascii=False) + '\n')
+            writer.write(rows)
+            done.update(rows['code'])
+            log(f"[{k}/{len(batches)}] {len(done)}/{len(items)}종목 완료 ({time.perf_counter() - t0:.1f}s)")
+    writer.close()
+    if done:
+        os.replace(out + ".tmp", out)
+    else:
+        # 한 종목도 받지 못했으면(네트워크 장애 등) 지난번 정상 결과를 빈 파일로 덮지 않는다
+        os.remove(out + ".tmp")
+        log(f"받은 종목이 없어 {out} 을(를) 그대로 둡니다")
+    if not failed:
+        os.remove(ckpt)
+    # stages: 워커 프로세스들의 단계별 누적 초 (병렬이라 합이 경과 시간보다 클 수 있음)
+    return {'scanned': len(done), 'failed': failed, 'seconds': time.perf_counter() - t0, 'stages': stages}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Day-1 골든크로스 배치 스캐너")
+    p.add_argument('--out', default=LATEST, help="출력 파일 (.parquet / .csv / .jsonl)")
+    p.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    p.add_argument('--batch', type=int, default=50, help="프로세스 하나가 한 번에 맡는 종목 수")
+    p.add_argument('--days', type=int, default=60, help="판정에 쓰는 조회 기간(일)")
+    p.add_argument('--rate', type=float, default=20, help="전체 초당 요청 한도")
+    p.add_argument('--resume', action='store_true', help="중단된 스캔을 체크포인트에서 이어서")
+    p.add_argument('--limit', type=int, default=None, help="앞에서부터 N종목만 (테스트용)")
+    args = p.parse_args(argv)
+
+    items = Universe.load().items()[:args.limit]
+    summary = run(items, args.out, args.workers, args.batch, args.days, args.resume, args.rate)
+    for code, err in summary['failed']:
+        print(f"[실패] {code}: {err}", file=sys.stderr)
+    if not summary['scanned']:
+        print(f"스캔된 종목 없음, 실패 {len(summary['failed'])}개 -> 결과 파일을 바꾸지 않음", file=sys.stderr)
+        return 1
+    hits = load_latest(args.out)
+    print(f"{summary['scanned']}종목 스캔, 신호 {int(hits['signal'].sum())}개, 실패 {len(summary['failed'])}개, "
+          f"{summary['seconds']:.1f}s -> {args.out}")
+    print("단계별(워커 합산): " + ", ".join(f"{k} {v:.1f}s" for k, v in summary['stages'].items()))
+    timer = perf.StageTimer()
+    timer.stages = summary['stages']
+    timer.dump(source='scanner', scanned=summary['scanned'], seconds=round(summary['seconds'], 2))
+    return 0 if not summary['failed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
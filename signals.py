@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+# --- 신호 엔진: 종목별 루프 대신 (봉 × 종목) 패널 하나로 전 종목을 한 번에 계산 ---
+
+MIN_BARS = 25
+
+
+def calculate_rsi(df, period=14):
+    delta = df['Close'].diff()
+    up, down = delta.copy(), delta.copy()
+    up[up < 0], down[down > 0] = 0, 0
+    _gain = up.ewm(com=(period - 1), min_periods=period).mean()
+    _loss = down.abs().ewm(com=(period - 1), min_periods=period).mean()
+    RS = _gain / _loss
+    return 100 - (100 / (1 + RS))
+
+
+def add_indicators(df):
+    df['MA10'] = df['Close'].rolling(10).mean()
+    df['MA20'] = df['Close'].rolling(20).mean()
+    df['RSI'] = calculate_rsi(df)
+    return df
+
+
+def build_panel(frames, min_bars=MIN_BARS, fields=('Open', 'Close', 'Volume')):
+    # 각 종목의 마지막 봉을 같은 행(맨 아래)에 맞춰 정렬한다.
+    # 날짜 기준으로 맞추면 거래정지 종목의 iloc[-1]이 NaN이 되어 기존 종목별 로직과 달라지기 때문.
+    frames = {c: df for c, df in frames.items() if df is not None and len(df) >= min_bars}
+    codes = list(frames)
+    depth = max((len(df) for df in frames.values()), default=0)
+    panel = {f: np.full((depth, len(codes)), np.nan) for f in fields}
+    for j, code in enumerate(codes):
+        df = frames[code]
+        for f in fields:
+            panel[f][depth - len(df):, j] = df[f].to_numpy(dtype=float)
+    panel['codes'] = codes
+    panel['last_date'] = np.array([frames[c].index[-1] for c in codes], dtype='datetime64[ns]')
+    return panel
+
+
+def ewm_mean(x, com, min_periods):
+    # pandas ewm(com, min_periods).mean() (adjust=True, ignore_na=False)와 같은 점화식을 열 전체에 한 번에
+    alpha = 1.0 / (1.0 + com)
+    out = np.full_like(x, np.nan)
+    weighted = x[0].copy()
+    old_wt = np.ones(x.shape[1])
+    nobs = (~np.isnan(weighted)).astype(int)
+    out[0] = np.where(nobs >= min_periods, weighted, np.nan)
+    for i in range(1, len(x)):
+        cur = x[i]
+        is_obs = ~np.isnan(cur)
+        nobs += is_obs
+        started = ~np.isnan(weighted)
+        old_wt = np.where(started, old_wt * (1 - alpha), old_wt)
+        upd = started & is_obs
+        weighted = np.where(upd, (old_wt * weighted + cur) / (old_wt + 1), weighted)
+        old_wt = np.where(upd, old_wt + 1, old_wt)
+        weighted = np.where(~started & is_obs, cur, weighted)
+        out[i] = np.where(nobs >= min_periods, weighted, np.nan)
+    return out
+
+
+def panel_rsi(close, period=14):
+    # calculate_rsi와 같은 연산을 (봉 × 종목) 배열 단위로
+    delta = np.vstack([np.full((1, close.shape[1]), np.nan), np.diff(close, axis=0)])
+    gain = ewm_mean(np.where(delta < 0, 0.0, delta), period - 1, period)
+    loss = ewm_mean(np.abs(np.where(delta > 0, 0.0, delta)), period - 1, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
+
+
+def _tail_mean(a, window, end):
+    # 끝에서 end번째 봉까지의 window 평균 (창 안에 NaN이 있으면 NaN = rolling의 min_periods와 동일)
+    stop = len(a) - end + 1
+    return a[stop - window:stop].sum(axis=0) / window if stop >= window else np.full(a.shape[1], np.nan)
+
+
+def scan_panel(panel):
+    c, o, v = panel['Close'], panel['Open'], panel['Volume']
+    codes = panel['codes']
+    if not codes:
+        return pd.DataFrame(columns=['price', 'ma10', 'ma20', 'rsi', 'vol', 'is_cross', 'is_above_ma',
+                                     'is_not_falling', 'signal', 'last_date'])
+    # 이평선은 마지막 두 봉만 필요 -> 창 합계로 직접 (KRX 가격/거래량은 정수라 합계가 정확해 rolling과 결과가 같다)
+    ma10, ma10_prev = _tail_mean(c, 10, 1), _tail_mean(c, 10, 2)
+    ma20, ma20_prev = _tail_mean(c, 20, 1), _tail_mean(c, 20, 2)
+    vol5 = _tail_mean(v, 5, 2)
+    rsi = panel_rsi(c)[-1]
+
+    # 1. Day-1 골든크로스  2. 주가가 두 이평선 위  3. 하락 중이 아님 (기존 탭2 조건 그대로)
+    is_cross = (ma10_prev <= ma20_prev) & (ma10 > ma20)
+    is_above_ma = (c[-1] > ma10) & (c[-1] > ma20)
+    is_not_falling = (c[-1] >= c[-2]) | (c[-1] >= o[-1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vol = np.where(vol5 > 0, v[-1] / vol5 * 100, 0.0)
+
+    out = pd.DataFrame({
+        'price': c[-1], 'ma10': ma10, 'ma20': ma20, 'rsi': rsi, 'vol': vol,
+        'is_cross': is_cross, 'is_above_ma': is_above_ma, 'is_not_falling': is_not_falling,
+        'signal': is_cross & is_above_ma & is_not_falling, 'last_date': panel['last_date'],
+    }, index=pd.Index(codes, name='code'))
+    return out.sort_values(['signal', 'vol'], ascending=False, kind='stable')
@@ -0,0 +1,155 @@
+import csv
+import sys
+from array import array
+
+import pandas as pd
+
+from signals import MIN_BARS
+
+# --- 증분 지표: 장중 재스캔 때 전체 히스토리를 다시 계산하지 않고 새 봉(또는 오늘 봉 수정)만 반영 ---
+
+NAN = float('nan')
+RSI_PERIOD = 14
+_ALPHA = 1.0 / RSI_PERIOD           # calculate_rsi의 ewm(com=period-1)과 같은 감쇠
+_DECAY = 1.0 - _ALPHA
+
+
+def _ewm_step(weighted, wt, x):
+    # pandas ewm(adjust=True) 점화식 한 스텝 -> (새 평균, 새 누적 가중치)
+    if weighted != weighted:
+        return x, 1.0
+    wt *= _DECAY
+    if weighted != x:
+        weighted = (wt * weighted + x) / (wt + 1.0)
+    return weighted, wt + 1.0
+
+
+class IncrementalIndicators:
+    __slots__ = ('code', 'closes', 'vols', 'pos', 'n', 'sum10', 'sum20', 'vsum',
+                 'gain', 'gain_wt', 'loss', 'loss_wt', 'nobs',
+                 'prev_close', 'open', 'ma10_prev', 'ma20_prev', 'last_date', '_undo')
+
+    def __init__(self, code=None):
+        self.code = code
+        self.closes = array('d', [NAN] * 20)   # MA10/MA20 공용 링버퍼
+        self.vols = array('d', [NAN] * 6)      # 오늘 + 직전 5봉 거래량
+        self.pos = self.n = self.nobs = 0
+        self.sum10 = self.sum20 = self.vsum = 0.0
+        self.gain = self.loss = NAN
+        self.gain_wt = self.loss_wt = 1.0
+        self.prev_close = self.open = self.ma10_prev = self.ma20_prev = NAN
+        self.last_date = None
+        self._undo = None
+
+    @classmethod
+    def from_frame(cls, df, code=None):
+        ind = cls(code)
+        for d, o, c, v in zip(df.index, df['Open'].to_numpy(float), df['Close'].to_numpy(float), df['Volume'].to_numpy(float)):
+            ind.update(d, o, c, v)
+        return ind
+
+    # --- 입력 ---
+    def update(self, date, open_, close, volume):
+        date = pd.Timestamp(date)
+        if self.last_date is not None:
+            if date < self.last_date:
+                raise ValueError(f"{self.code}: {date:%Y-%m-%d} 는 마지막 봉({self.last_date:%Y-%m-%d})보다 과거입니다")
+            if date == self.last_date:
+                # 같은 날짜 = 오늘 미완성 봉의 수정 -> 직전 상태로 되돌린 뒤 다시 반영
+                self._rollback()
+        self._push(date, float(open_), float(close), float(volume))
+        return self.signals()
+
+    def _push(self, date, open_, close, volume):
+        i, j = self.pos % 20, self.n % 6
+        old20, old10, oldv = self.closes[i], self.closes[(i - 10) % 20], self.vols[j]
+        self._undo = (self.pos, self.n, self.sum10, self.sum20, self.vsum, self.gain, self.gain_wt,
+                      self.loss, self.loss_wt, self.nobs, self.prev_close, self.open, self.ma10_prev,
+                      self.ma20_prev, self.last_date, old20, oldv)
+
+        last_close = self.closes[(i - 1) % 20] if self.n else NAN
+        self.ma10_prev, self.ma20_prev = self.ma10, self.ma20
+        self.sum20 += close - (old20 if self.n >= 20 else 0.0)
+        self.sum10 += close - (old10 if self.n >= 10 else 0.0)
+        self.vsum += volume - (oldv if self.n >= 6 else 0.0)
+        self.closes[i], self.vols[j] = close, volume
+
+        if self.n:
+            delta = close - last_close
+            self.gain, self.gain_wt = _ewm_step(self.gain, self.gain_wt, max(delta, 0.0))
+            self.loss, self.loss_wt = _ewm_step(self.loss, self.loss_wt, -min(delta, 0.0))
+            self.nobs += 1
+        self.prev_close, self.open, self.last_date = last_close, open_, date
+        self.pos, self.n = self.pos + 1, self.n + 1
+
+    def _rollback(self):
+        (self.pos, self.n, self.sum10, self.sum20, self.vsum, self.gain, self.gain_wt, self.loss,
+         self.loss_wt, self.nobs, self.prev_close, self.open, self.ma10_prev, self.ma20_prev,
+         self.last_date, old20, oldv) = self._undo
+        self.closes[self.pos % 20], self.vols[self.n % 6] = old20, oldv
+        self._undo = None
+
+    # --- 출력 ---
+    @property
+    def close(self):
+        return self.closes[(self.pos - 1) % 20] if self.n else NAN
+
+    @property
+    def ma10(self):
+        return self.sum10 / 10 if self.n >= 10 else NAN
+
+    @property
+    def ma20(self):
+        return self.sum20 / 20 if self.n >= 20 else NAN
+
+    @property
+    def rsi(self):
+        if self.nobs < RSI_PERIOD:
+            return NAN
+        try:
+            return 100 - (100 / (1 + self.gain / self.loss))
+        except ZeroDivisionError:
+            return 100.0 if self.gain else NAN
+
+    @property
+    def vol_ratio(self):
+        # rolling(5).mean().iloc[-2] 기준 (오늘 제외 직전 5봉)
+        if self.n < 6:
+            return 0.0
+        prev5 = (self.vsum - self.vols[(self.n - 1) % 6]) / 5
+        return self.vols[(self.n - 1) % 6] / prev5 * 100 if prev5 > 0 else 0.0
+
+    def signals(self):
+        c, ma10, ma20 = self.close, self.ma10, self.ma20
+        is_cross = self.ma10_prev <= self.ma20_prev and ma10 > ma20
+        is_above_ma = c > ma10 and c > ma20
+        is_not_falling = c >= self.prev_close or c >= self.open
+        return {
+            'code': self.code, 'date': self.last_date, 'price': c, 'ma10': ma10, 'ma20': ma20,
+            'rsi': self.rsi, 'vol': self.vol_ratio, 'is_cross': is_cross, 'is_above_ma': is_above_ma,
+            'is_not_falling': is_not_falling,
+            'signal': self.n >= MIN_BARS and is_cross and is_above_ma and is_not_falling,
+        }
+
+
+# --- 스트리밍 모드: 제너레이터나 리플레이 파일(code,date,open,close,volume)에서 봉을 받아 신호를 흘려보냄 ---
+def read_replay(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield row['code'], row['date'], float(row['open']), float(row['close']), float(row['volume'])
+
+
+def replay(bars, book=None):
+    book = {} if book is None else book
+    for code, date, open_, close, volume in bars:
+        ind = book.get(code)
+        if ind is None:
+            ind = book[code] = IncrementalIndicators(code)
+        yield ind.update(date, open_, close, volume)
+
+
+if __name__ == "__main__":
+    # python streaming.py replay.csv -> 신호가 켜지는 순간만 출력
+    for s in replay(read_replay(sys.argv[1])):
+        if s['signal']:
+            print(f"{s['date']:%Y-%m-%d} {s['code']} {s['price']:,.0f} RSI {s['rsi']:.1f} 거래량 {s['vol']:.0f}%")
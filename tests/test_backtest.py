@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import HORIZONS, RULES, Replay, load_panel
+from signals import build_panel, scan_panel
+
+
+def panel(T=300, N=60, seed=0):
+    rng = np.random.default_rng(seed)
+    close = np.round(1000 * np.exp(np.cumsum(rng.normal(0, 0.03, (T, N)), axis=0)))
+    return {'dates': pd.bdate_range(end='2026-10-16', periods=T), 'codes': [f"{i:06d}" for i in range(N)],
+            'Open': np.round(close * rng.uniform(0.98, 1.02, (T, N))), 'Close': close,
+            'Volume': rng.integers(0, 1000, (T, N)).astype(float)}
+
+
+def test_last_day_matches_scanner():
+    p = panel()
+    frames = {c: pd.DataFrame({f: p[f][:, j] for f in ('Open', 'Close', 'Volume')}, index=p['dates'])
+              for j, c in enumerate(p['codes'])}
+    want = scan_panel(build_panel(frames)).reindex(p['codes'])['signal'].to_numpy()
+    assert (Replay(p).signals({})['day1'][-1] == want).all()
+
+
+def test_turnover_hand_example():
+    # horizon 1 -> 신호 다음 날 하루 보유. 보유: d1 {A,B}, d2 {A}, d3 {}
+    # 회전율 = 변경 / (전날 + 오늘 보유): d1 2/2, d2 1/3, d3 1/1
+    p = panel(T=4, N=2)
+    sig = np.array([[1, 1], [1, 0], [0, 0], [0, 0]], dtype=bool)
+    m = Replay(p).metrics(sig, 1, 1)
+    assert m['turnover'] == pytest.approx((1 + 1 / 3 + 1) / 3)
+
+
+def test_turnover_is_a_fraction():
+    replay = Replay(panel(seed=3))
+    for row in replay.run(horizons=HORIZONS, rules=tuple(RULES)):
+        assert 0.0 <= row['turnover'] <= 1.0, row
+
+
+class EmptyCache:
+    # 모든 종목이 빈 일봉 (상장폐지/수집 실패와 같은 결과)
+    def read(self, code, start):
+        return pd.DataFrame(columns=['Open', 'Close', 'Volume'], index=pd.DatetimeIndex([], name='Date'))
+
+    def flush(self):
+        pass
+
+
+@pytest.mark.parametrize('codes', [[], ['000001', '000002']])
+def test_load_panel_with_nothing_loaded(codes):
+    p = load_panel(codes, cache=EmptyCache())
+    assert p['codes'] == [] and len(p['dates']) == 0
+    assert all(p[f].shape == (0, 0) for f in ('Open', 'Close', 'Volume'))
@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pandas as pd
+
+from fetcher import FetchError, fetch_many
+
+LATENCY = 0.05
+CODES = [f"{i:06d}" for i in range(40)]
+
+
+def slow_reader(code, start):
+    # 네트워크 왕복을 흉내 낸 로컬 가짜 데이터 소스
+    time.sleep(LATENCY)
+    return pd.DataFrame({'Close': [1.0, 2.0]}, index=pd.to_datetime(['2026-10-15', '2026-10-16']))
+
+
+def collect(codes, **kw):
+    return {code: (df, err) for code, df, err in fetch_many(codes, '2026-01-01', rate=None, **kw)}
+
+
+def test_concurrent_is_faster_than_sequential():
+    t0 = time.perf_counter()
+    for code in CODES:
+        slow_reader(code, '2026-01-01')
+    sequential = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    out = collect(CODES, reader=slow_reader, max_workers=16)
+    concurrent = time.perf_counter() - t0
+
+    assert set(out) == set(CODES)
+    assert all(err is None and len(df) == 2 for df, err in out.values())
+    assert sequential / concurrent > 4
+
+
+def test_retries_recover_from_transient_failures():
+    calls, lock = {}, threading.Lock()
+
+    def flaky(code, start):
+        with lock:
+            calls[code] = calls.get(code, 0) + 1
+            n = calls[code]
+        if n < 3:
+            raise ConnectionError("reset by peer")
+        return slow_reader(code, start)
+
+    out = collect(CODES[:5], reader=flaky, retries=3, backoff=0.01)
+    assert all(err is None for _, err in out.values())
+    assert all(n == 3 for n in calls.values())
+
+
+def test_gives_up_after_retries():
+    def broken(code, start):
+        raise ConnectionError("down")
+
+    (df, err), = collect(CODES[:1], reader=broken, retries=2, backoff=0.01).values()
+    assert df is None
+    assert isinstance(err, FetchError)
+    assert err.attempts == 2
+    assert isinstance(err.cause, ConnectionError)
+
+
+def test_slow_call_times_out():
+    def hung(code, start):
+        time.sleep(1)
+
+    t0 = time.perf_counter()
+    (df, err), = collect(CODES[:1], reader=hung, retries=1, timeout=0.1).values()
+    assert time.perf_counter() - t0 < 0.5
+    assert df is None
+    assert isinstance(err, FetchError)
+    assert isinstance(err.cause, TimeoutError)
+
+
+def test_rate_limit_spaces_out_calls():
+    # 초당 20회, 버스트 1 -> 11번째 호출은 최소 0.5초 뒤
+    t0 = time.perf_counter()
+    out = dict((c, e) for c, _, e in fetch_many(CODES[:11], '2026-01-01', reader=lambda c, s: pd.DataFrame(),
+                                                host="test-limit", rate=20, burst=1))
+    assert all(e is None for e in out.values())
+    assert time.perf_counter() - t0 >= 0.45
+
+
+def test_empty_codes():
+    assert collect([], reader=slow_reader) == {}
+
+def test_stalled_calls_do_not_block_other_codes():
+    # 4개 종목의 첫 호출이 5초 멈춤 -> 버려진 호출이 자리를 차지하지 않아야 나머지는 제시간에, 멈춘 종목은 재시도로 성공
+    calls, lock = {}, threading.Lock()
+    stalled = set(CODES[:4])
+
+    def stalling(code, start):
+        with lock:
+            calls[code] = calls.get(code, 0) + 1
+            n = calls[code]
+        if code in stalled and n == 1:
+            time.sleep(5)
+        return slow_reader(code, start)
+
+    t0 = time.perf_counter()
+    out = collect(CODES, reader=stalling, max_workers=4, timeout=0.5, retries=3, backoff=0.01)
+    assert time.perf_counter() - t0 < 3
+    assert all(err is None for _, err in out.values())
+    assert all(calls[c] == 1 for c in CODES if c not in stalled)
+    assert all(calls[c] == 2 for c in stalled)
@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import krx_calendar as cal
+from investor import InvestorClient
+
+GOOD = {'result': [
+    {'bizdate': '20261016', 'institutionNetBuyVolume': '+1,200', 'foreignNetBuyVolume': '-300'},
+    {'bizdate': '20261015', 'institutionNetBuyVolume': '-200', 'foreignNetBuyVolume': '1,000'},
+    {'bizdate': '20261014', 'institutionNetBuyVolume': '50', 'foreignNetBuyVolume': '0'},
+]}
+# 종목코드 -> (상태 코드, 응답 본문, 지연 초): m.stock.naver.com /api/stock/<code>/investor 흉내
+ROUTES = {
+    '000001': (200, json.dumps(GOOD), 0),
+    '000002': (404, '{"message": "not found"}', 0),
+    '000003': (200, '{"result": [', 0),
+    '000004': (200, json.dumps(GOOD), 1.0),
+    '000005': (200, '{"result": []}', 0),
+}
+
+
+@pytest.fixture
+def stub():
+    hits = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            code = self.path.strip('/').split('/')[0]
+            hits[code] += 1
+            status, body, delay = ROUTES.get(code, (404, '', 0))
+            time.sleep(delay)
+            body = body.encode()
+            try:
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except OSError:
+                pass  # 클라이언트가 타임아웃으로 먼저 끊은 경우
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", hits
+    server.shutdown()
+    server.server_close()
+
+
+def client_for(base_url, now=datetime(2026, 10, 16, 18, 0, tzinfo=cal.KST)):
+    clock = {'now': now}
+    client = InvestorClient(base_url, timeout=(0.5, 0.3), clock=lambda: clock['now'])
+    return client, clock
+
+
+def test_good_payload(stub):
+    client, _ = client_for(stub[0])
+    flow = client.get('000001')
+    assert flow.ok
+    assert (flow.inst, flow.frgn) == (1200, -300)
+    assert flow.history[1] == ('20261015', -200, 1000)
+    assert flow.trend(2) == (1000, 700)
+    assert flow.trend() == (1050, 700)
+
+
+@pytest.mark.parametrize('code, prefix', [('000002', 'http:'), ('000003', 'parse:'), ('000004', 'timeout'),
+                                          ('000005', 'empty')])
+def test_failures_are_reported_not_zeroed(stub, code, prefix):
+    client, _ = client_for(stub[0])
+    flow = client.get(code)
+    assert not flow.ok
+    assert flow.error.startswith(prefix)
+    assert flow.history == ()
+
+
+def test_second_get_many_refetches_only_failures(stub):
+    base_url, hits = stub
+    client, _ = client_for(base_url)
+    codes = list(ROUTES)
+    first = client.get_many(codes)
+    assert [c for c, f in first.items() if f.ok] == ['000001']
+    before = hits.copy()
+    second = client.get_many(codes)
+    assert second['000001'] is first['000001']
+    assert hits['000001'] == before['000001']
+    assert all(hits[c] == before[c] + 1 for c in codes if c != '000001')
+
+
+def test_cache_drops_previous_sessions(stub):
+    client, clock = client_for(stub[0])
+    client.get('000001')
+    assert len(client._cache) == 1
+    clock['now'] = datetime(2026, 10, 19, 18, 0, tzinfo=cal.KST)  # 다음 거래일(월)
+    client.get('000001')
+    assert [k[1] for k in client._cache] == [cal.latest_session(clock['now'])]
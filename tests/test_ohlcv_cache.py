@@ -0,0 +1,232 @@
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import krx_calendar as cal
+from fetcher import RateLimiter
+from ohlcv_cache import OhlcvCache
+
+NOW = datetime(2026, 10, 16, 18, 0, tzinfo=cal.KST)   # 금요일 장 마감 후 -> 받은 봉은 모두 확정
+ROW_BYTES = 50                                          # 응답 XML의 <item data="..."/> 한 줄 크기
+
+
+def reader(code, start=None, end=None):
+    idx = pd.bdate_range(end='2026-10-16', periods=300, name='Date')
+    close = np.arange(1000.0, 1300.0) + int(code)
+    df = pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': close}, index=idx)
+    df['Change'] = df['Close'].pct_change()
+    return df.loc[start:], 0
+
+
+class Market:
+    # 시계에 맞춰 그 시점에 존재하는 봉만 돌려주는 가짜 데이터 소스. 장중이면 마지막 봉이 분마다 바뀌는 미완성 봉
+    def __init__(self, now=NOW):
+        self.now = now
+        self.calls = []
+
+    def bars(self, code):
+        idx = pd.bdate_range('2025-01-01', cal.latest_session(self.now), name='Date')
+        close = (idx - pd.Timestamp('2025-01-01')).days.to_numpy(float) + 1000 + int(code)
+        if cal.is_market_open(self.now):
+            close[-1] += self.now.hour * 60 + self.now.minute
+        return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': close}, index=idx)
+
+    def full(self, code, start):
+        self.calls.append(('full', code))
+        df = self.bars(code)
+        df['Change'] = df['Close'].pct_change()
+        df = df.loc[start:]
+        return df, ROW_BYTES * len(df)
+
+    def tail(self, code, count, timeout=10):
+        self.calls.append(('tail', code, count))
+        df = self.bars(code).tail(count)
+        return df, ROW_BYTES * len(df)
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    def make(**kw):
+        kw.setdefault('flush_interval', 0)                # 기본: 저장마다 인덱스 기록 (다중 인스턴스 병합 확인용)
+        return OhlcvCache(path=str(tmp_path), full_reader=reader, tail_reader=lambda c, n, timeout=10: (reader(c)[0].tail(n), 0),
+                          clock=lambda: NOW, limiter=RateLimiter(float('inf')), **kw)
+    return make
+
+
+@pytest.fixture
+def market_cache(tmp_path):
+    market = Market()
+    cache = OhlcvCache(path=str(tmp_path), full_reader=market.full, tail_reader=market.tail, clock=lambda: market.now,
+                       limiter=RateLimiter(float('inf')), flush_interval=0)
+    return market, cache
+
+
+def at(day, hour, minute=0):
+    return datetime(2026, 10, day, hour, minute, tzinfo=cal.KST)
+
+
+def test_calendar_decides_when_to_call(market_cache):
+    # 금 마감 후 채움 -> 토요일/월 장 시작 전은 호출 없음 -> 월 10:00에 증분 1회
+    market, cache = market_cache
+    cache.read('000001', '2026-01-01')
+    assert market.calls == [('full', '000001')]
+    for market.now in (at(17, 12), at(19, 8, 30)):
+        cache.read('000001', '2026-01-01')
+    assert len(market.calls) == 1
+    assert cache.stats['hits'] == 2
+    market.now = at(19, 10)
+    df = cache.read('000001', '2026-01-01')
+    assert market.calls[1:] == [('tail', '000001', 3)]          # 금요일 봉부터 다시 + 월요일 미완성 봉
+    assert df.index[-1] == pd.Timestamp('2026-10-19')
+    assert df['Close'].equals(market.bars('000001').loc['2026-01-01':, 'Close'])
+
+
+def test_append_fetches_only_new_bars(market_cache):
+    market, cache = market_cache
+    cache.read('000001', '2026-01-01')
+    rows = cache.stats['rows']
+    market.now = at(22, 18)                                      # 목요일 마감 후: 월~목 4봉이 새로 생김
+    df = cache.read('000001', '2026-01-01')
+    assert market.calls[1:] == [('tail', '000001', 6)]            # 새 봉 4개 + 마지막 캐시 봉(금)부터 겹쳐 받는 2봉
+    assert cache.stats['rows'] - rows == 6
+    expected = market.bars('000001').loc['2026-01-01':]
+    assert df[['Open', 'High', 'Low', 'Close', 'Volume']].equals(expected)
+    assert df['Change'].iloc[1:].equals(expected['Close'].pct_change().iloc[1:])
+    assert df.index.is_unique
+
+
+def test_intraday_ttl_and_partial_candle_overwrite(market_cache):
+    market, cache = market_cache
+    market.now = at(19, 10)
+    first = cache.read('000001', '2026-01-01')
+    market.now = at(19, 10).replace(second=30)               # TTL(60초) 안 -> 같은 미완성 봉 재사용
+    assert cache.read('000001', '2026-01-01').equals(first)
+    assert len(market.calls) == 1
+    market.now = at(19, 10, 5)                                   # TTL 지남 -> 증분, 미완성 봉을 새 값으로 덮어씀
+    second = cache.read('000001', '2026-01-01')
+    assert market.calls[1] == ('tail', '000001', 2)
+    assert len(second) == len(first)
+    assert second['Close'].iloc[-1] == first['Close'].iloc[-1] + 5
+    market.now = at(19, 18)                                      # 마감 확정 뒤 받으면 이후로는 호출 없음
+    settled = cache.read('000001', '2026-01-01')
+    assert settled['Close'].iloc[-1] == market.bars('000001')['Close'].iloc[-1]
+    market.now = at(20, 8)
+    cache.read('000001', '2026-01-01')
+    assert len(market.calls) == 3
+
+
+def test_warm_runs_cut_calls_and_bytes(market_cache):
+    # 캐시 없이는 스캔마다 종목당 전체 조회 1회 -> 같은 세션 재스캔은 0회, 다음 거래일은 증분만
+    market, cache = market_cache
+    codes = [f"{i:06d}" for i in range(50)]
+    for code in codes:
+        cache.read(code, '2026-08-01')
+    cold = dict(cache.stats)
+    assert cold['calls'] == len(codes) and cold['bytes'] > 0
+
+    for code in codes:
+        cache.read(code, '2026-08-01')
+    assert cache.stats['calls'] == cold['calls']
+
+    market.now = at(19, 18)
+    for code in codes:
+        cache.read(code, '2026-08-01')
+    warm = {k: cache.stats[k] - cold[k] for k in ('calls', 'bytes')}
+    assert warm['calls'] == len(codes)
+    assert warm['bytes'] < 0.1 * cold['bytes']
+
+
+def test_eviction_skips_codes_being_fetched(market_cache):
+    # 000001 증분 조회가 진행되는 동안 다른 종목 저장이 용량을 넘겨도 000001은 축출되지 않는다
+    market, cache = market_cache
+    cache.read('000001', '2026-01-01')
+    cache.read('000002', '2026-01-01')
+    cache.max_bytes = cache._bytes
+    started, release = threading.Event(), threading.Event()
+    tail = market.tail
+
+    def blocking_tail(code, count, timeout=10):
+        started.set()
+        release.wait(5)
+        return tail(code, count)
+
+    cache.tail_reader = blocking_tail
+    market.now = at(19, 10)
+    errors = []
+
+    def append():
+        try:
+            cache.read('000001', '2026-01-01')
+        except Exception as e:
+            errors.append(e)
+
+    t = threading.Thread(target=append)
+    t.start()
+    assert started.wait(5)
+    cache.read('000003', '2026-01-01')
+    release.set()
+    t.join(5)
+    assert errors == []
+    assert '000001' in cache._index and '000002' not in cache._index
+
+
+def test_eviction_is_least_recently_used(make_cache):
+    cache = make_cache()
+    for code in ('000001', '000002', '000003'):
+        cache.read(code, '2026-01-01')
+        time.sleep(0.01)
+    cache.read('000001', '2026-01-01')                     # 적중 -> 가장 최근 사용
+    assert cache.stats['hits'] == 1
+    time.sleep(0.01)
+    cache.read('000004', '2026-01-01')                     # 저장 -> 인덱스 병합
+    size = cache._index['000001']['bytes']
+    cache.max_bytes = int(size * 3.5)
+    cache.read('000005', '2026-01-01')
+    assert sorted(cache._index) == ['000001', '000004', '000005']
+
+
+def test_hit_times_survive_index_merge(make_cache):
+    # 다른 프로세스(여기서는 두 번째 인스턴스)가 인덱스를 다시 써도 내 적중 시각이 덮이지 않는다
+    cache = make_cache()
+    cache.read('000001', '2026-01-01')
+    cache.read('000002', '2026-01-01')
+    other = make_cache()
+    time.sleep(0.01)
+    cache.read('000001', '2026-01-01')
+    hit_at = cache._index['000001']['last_access']
+    other.read('000003', '2026-01-01')
+    cache.read('000004', '2026-01-01')
+    assert cache._index['000001']['last_access'] == hit_at
+    assert make_cache()._index['000001']['last_access'] == hit_at
+
+
+def test_index_writes_are_batched(make_cache):
+    # 콜드 스캔에서 종목마다 인덱스 전체를 다시 쓰지 않는다 (선형 시간 유지)
+    cache = make_cache(flush_interval=60)
+    saves = []
+    save = cache._save_index
+    cache._save_index = lambda: saves.append(1) or save()
+    codes = [f"{i:06d}" for i in range(200)]
+    for code in codes:
+        cache.read(code, '2026-01-01')
+    assert saves == []
+    assert make_cache()._index == {}
+    cache.flush()
+    assert len(saves) == 1
+    assert sorted(make_cache()._index) == codes
+    cache.flush()                                          # 바뀐 게 없으면 쓰지 않음
+    assert len(saves) == 1
+
+
+def test_byte_total_tracks_index(make_cache):
+    cache = make_cache(flush_interval=60)
+    for i in range(10):
+        cache.read(f"{i:06d}", '2026-01-01')
+    assert cache._bytes == sum(m['bytes'] for m in cache._index.values())
+    cache.max_bytes = cache._bytes // 2
+    cache.read('000099', '2026-01-01')
+    assert cache._bytes == sum(m['bytes'] for m in cache._index.values()) <= cache.max_bytes
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from investor import InvestorFlow
+from scanner import evaluate
+
+
+def signal_frame(bump):
+    # 내리다가 마지막 봉에서 급등 -> 오늘 골든크로스 (신호 종목)
+    close = np.array(list(range(2000, 1700, -10)) + [3500 + bump], dtype=float)
+    idx = pd.bdate_range(end='2026-10-16', periods=len(close), name='Date')
+    return pd.DataFrame({'Open': np.roll(close, 1), 'Close': close, 'Volume': np.full(len(close), 1000.0)}, index=idx)
+
+
+class StubClient:
+    def __init__(self, flows):
+        self.flows = flows
+
+    def get_many(self, codes):
+        return {c: self.flows[c] for c in codes}
+
+
+def test_failed_flow_lookup_is_missing_not_zero():
+    frames = {c: signal_frame(i) for i, c in enumerate(('000001', '000002', '000003'))}
+    client = StubClient({
+        '000001': InvestorFlow('000001', 100, -50, (('20261016', 100, -50), ('20261015', -400, 0))),
+        '000002': InvestorFlow('000002', error="timeout"),
+        '000003': InvestorFlow('000003', -10, -20, (('20261016', -10, -20),)),
+    })
+    rows = evaluate(frames, {}, client).set_index('code')
+    assert rows['signal'].all()
+    assert rows.loc['000001', ['inst', 'frgn', 'flow5']].tolist() == [100, -50, -350]
+    assert rows.loc['000002', ['inst', 'frgn', 'flow5']].isna().all()
+    assert rows.loc['000002', 'flow_err'] == "timeout"
+    # 수급 추세순: 조회 실패 종목은 실제 순매도 종목보다 뒤
+    order = rows.sort_values('flow5', ascending=False, na_position='last').index.tolist()
+    assert order == ['000003', '000001', '000002']
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from signals import MIN_BARS, build_panel, calculate_rsi, scan_panel
+
+
+def legacy(df):
+    # 패널 엔진 이전 탭2 종목별 로직 (app.py 원본 그대로)
+    df = df.copy()
+    df['MA10'] = df['Close'].rolling(10).mean()
+    df['MA20'] = df['Close'].rolling(20).mean()
+    vol5 = df['Volume'].rolling(5).mean().iloc[-2]
+    return {
+        'price': df['Close'].iloc[-1],
+        'ma10': df['MA10'].iloc[-1],
+        'ma20': df['MA20'].iloc[-1],
+        'rsi': calculate_rsi(df).iloc[-1],
+        'vol': (df['Volume'].iloc[-1] / vol5 * 100) if vol5 > 0 else 0,
+        'is_cross': df['MA10'].iloc[-2] <= df['MA20'].iloc[-2] and df['MA10'].iloc[-1] > df['MA20'].iloc[-1],
+        'is_above_ma': df['Close'].iloc[-1] > df['MA10'].iloc[-1] and df['Close'].iloc[-1] > df['MA20'].iloc[-1],
+        'is_not_falling': df['Close'].iloc[-1] >= df['Close'].iloc[-2] or df['Close'].iloc[-1] >= df['Open'].iloc[-1],
+    }
+
+
+def frame(close, volume=None, open_=None, end='2026-10-16'):
+    close = np.asarray(close, dtype=float)
+    idx = pd.bdate_range(end=end, periods=len(close), name='Date')
+    volume = np.full(len(close), 1000.0) if volume is None else np.asarray(volume, dtype=float)
+    open_ = np.roll(close, 1) if open_ is None else np.asarray(open_, dtype=float)
+    return pd.DataFrame({'Open': open_, 'Close': close, 'Volume': volume}, index=idx)
+
+
+def random_frames(n, seed=0):
+    # KRX처럼 정수 가격/거래량, 길이와 마지막 날짜가 제각각인 합성 종목
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for i in range(n):
+        bars = int(rng.integers(MIN_BARS, 60))
+        close = np.round(rng.uniform(1000, 50000) * np.exp(np.cumsum(rng.normal(0, 0.03, bars))))
+        open_ = np.round(close * (1 + rng.normal(0, 0.01, bars)))
+        volume = rng.integers(0, 100000, bars)
+        end = pd.Timestamp('2026-10-16') - pd.offsets.BDay(int(rng.integers(0, 3)))
+        frames[f"{i:06d}"] = frame(close, volume, open_, end)
+    return frames
+
+
+def assert_matches(frames):
+    table = scan_panel(build_panel(frames))
+    expected = {c: legacy(df) for c, df in frames.items() if len(df) >= MIN_BARS}
+    assert set(table.index) == set(expected)
+    for code, want in expected.items():
+        got = table.loc[code]
+        for key in ('price', 'ma10', 'ma20', 'rsi', 'vol'):
+            np.testing.assert_allclose(got[key], want[key], rtol=1e-9, equal_nan=True, err_msg=f"{code} {key}")
+        for key in ('is_cross', 'is_above_ma', 'is_not_falling'):
+            assert bool(got[key]) == bool(want[key]), f"{code} {key}"
+        assert bool(got['signal']) == (want['is_cross'] and want['is_above_ma'] and want['is_not_falling'])
+        assert got['last_date'] == frames[code].index[-1]
+    return table
+
+
+def test_random_universe_matches_legacy():
+    table = assert_matches(random_frames(400))
+    assert table['is_cross'].any()
+
+
+def test_golden_cross_today():
+    # 내리다가 마지막 봉에서 급등 -> 10일선이 오늘 20일선을 뚫는다
+    close = list(range(2000, 1700, -10)) + [3500]
+    table = assert_matches({'000001': frame(close)})
+    assert table.loc['000001', 'signal']
+
+
+def test_flat_prices():
+    # 변화가 없으면 RSI는 0/0 -> NaN, 크로스 없음
+    table = assert_matches({'000001': frame(np.full(40, 5000))})
+    assert np.isnan(table.loc['000001', 'rsi'])
+    assert not table.loc['000001', 'is_cross']
+
+
+def test_halted_stock():
+    # 거래정지: 마지막 며칠 같은 가격 + 거래량 0, 다른 종목보다 마지막 날짜가 이르다
+    close = np.round(1000 * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.02, 40))))
+    close[-5:] = close[-6]
+    volume = np.full(40, 5000.0)
+    volume[-5:] = 0
+    frames = {'000001': frame(close, volume, end='2026-10-09'), '000002': frame(np.arange(1000, 1040))}
+    table = assert_matches(frames)
+    assert table.loc['000001', 'vol'] == 0
+
+
+def test_zero_volume():
+    table = assert_matches({'000001': frame(np.arange(1000, 1030), np.zeros(30))})
+    assert table.loc['000001', 'vol'] == 0
+
+
+@pytest.mark.parametrize('bars', [0, 1, MIN_BARS - 1])
+def test_short_history_is_skipped(bars):
+    frames = {'000001': frame(np.arange(1000, 1000 + bars)), '000002': frame(np.arange(1000, 1030))}
+    table = assert_matches(frames)
+    assert '000001' not in table.index
+
+
+def test_empty_universe():
+    table = scan_panel(build_panel({}))
+    assert table.empty
+    assert 'signal' in table.columns
@@ -0,0 +1,89 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from signals import add_indicators
+from streaming import IncrementalIndicators, read_replay, replay
+
+
+def frame(bars=80, seed=0):
+    rng = np.random.default_rng(seed)
+    close = np.round(10000 * np.exp(np.cumsum(rng.normal(0, 0.02, bars))))
+    idx = pd.bdate_range(end='2026-10-16', periods=bars, name='Date')
+    return pd.DataFrame({'Open': np.round(close * (1 + rng.normal(0, 0.01, bars))), 'Close': close,
+                         'Volume': rng.integers(0, 100000, bars).astype(float)}, index=idx)
+
+
+def batch(df):
+    # 탭1/탭2 배치 경로: rolling(10/20) + calculate_rsi + 직전 5봉 거래량 비율
+    df = add_indicators(df.copy())
+    vol5 = df['Volume'].rolling(5).mean().shift(1)
+    df['vol'] = np.where(vol5 > 0, df['Volume'] / vol5 * 100, 0.0)
+    return df
+
+
+def same(a, b):
+    assert a.keys() == b.keys()
+    for k in a:
+        if isinstance(a[k], float) and math.isnan(a[k]):
+            assert isinstance(b[k], float) and math.isnan(b[k]), k
+        else:
+            assert a[k] == b[k], k
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_every_bar_matches_batch(seed):
+    df = frame(seed=seed)
+    want = batch(df)
+    ind = IncrementalIndicators('000001')
+    for i, (d, r) in enumerate(df.iterrows()):
+        ind.update(d, r['Open'], r['Close'], r['Volume'])
+        for attr, col in (('ma10', 'MA10'), ('ma20', 'MA20'), ('rsi', 'RSI')):
+            assert getattr(ind, attr) == pytest.approx(want[col].iloc[i], rel=1e-9, nan_ok=True), (i, attr)
+        if i >= 5:
+            assert ind.vol_ratio == pytest.approx(want['vol'].iloc[i], rel=1e-9), i
+
+
+def test_from_frame_matches_batch():
+    df = frame(200, seed=7)
+    want = batch(df).iloc[-1]
+    ind = IncrementalIndicators.from_frame(df, '000001')
+    assert ind.ma10 == pytest.approx(want['MA10'], rel=1e-9)
+    assert ind.ma20 == pytest.approx(want['MA20'], rel=1e-9)
+    assert ind.rsi == pytest.approx(want['RSI'], rel=1e-9)
+    assert ind.vol_ratio == pytest.approx(want['vol'], rel=1e-9)
+
+
+def test_same_date_revision_equals_clean_update():
+    df = frame(60, seed=3)
+    last = df.index[-1]
+    revised = IncrementalIndicators.from_frame(df.iloc[:-1])
+    revised.update(last, 1.0, 1.0, 1.0)                       # 장중 미완성 봉
+    revised.update(last, 9000.0, 9500.0, 2000.0)              # 같은 날짜로 수정
+    revised.update(last, 9100.0, 9700.0, 3000.0)              # 한 번 더 수정
+    clean = IncrementalIndicators.from_frame(df.iloc[:-1])
+    clean.update(last, 9100.0, 9700.0, 3000.0)
+    same(revised.signals(), clean.signals())
+
+
+def test_past_date_raises():
+    ind = IncrementalIndicators.from_frame(frame(30))
+    with pytest.raises(ValueError):
+        ind.update('2026-01-02', 1.0, 1.0, 1.0)
+
+
+def test_replay_from_csv(tmp_path):
+    df = frame(40, seed=11)
+    rows = [(code, d.strftime('%Y-%m-%d'), r['Open'], r['Close'], r['Volume'])
+            for d, r in df.iterrows() for code in ('000001', '000002')]
+    path = tmp_path / 'replay.csv'
+    pd.DataFrame(rows, columns=['code', 'date', 'open', 'close', 'volume']).to_csv(path, index=False)
+
+    book = {}
+    out = list(replay(read_replay(path), book))
+    assert len(out) == 80
+    assert set(book) == {'000001', '000002'}
+    same(out[-1], IncrementalIndicators.from_frame(df, '000002').signals())
+    assert out[-2]['code'] == '000001'
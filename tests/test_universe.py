@@ -0,0 +1,73 @@
+import pytest
+
+from universe import Universe, choseong
+
+ROWS = [
+    ('005930', '삼성전자', 'KOSPI', '반도체'),
+    ('000660', 'SK하이닉스', 'KOSPI', '반도체'),
+    ('5380', '현대차', 'KOSPI', '자동차'),            # 앞자리 0이 빠진 숫자 코드 -> '005380'
+    ('0001A0', '신규상장', 'KOSDAQ', ''),              # 영숫자 신규 코드
+    ('028050', '삼성E&A', 'KOSPI', '건설'),
+    ('028100', 'KCC건설', 'KOSDAQ', '건설'),
+    ('028100', '동아지질', 'KOSDAQ', '건설'),          # 코드 중복 (원래 STOCK_LIST에 있던 실수)
+    ('035420', '삼성전자', 'KOSPI', ''),               # 이름 중복
+    ('ABC', '잘못된코드', '', ''),
+    ('1234567', '너무긴코드', '', ''),
+    ('00593a', '소문자코드', '', ''),
+]
+
+
+@pytest.fixture
+def universe():
+    return Universe(ROWS)
+
+
+def test_codes_are_validated_before_padding(universe):
+    assert '005380' in universe and universe.name('005380') == '현대차'
+    assert '0001A0' in universe
+    assert '000ABC' not in universe
+    assert universe.issues['invalid_code'] == [('ABC', '잘못된코드'), ('1234567', '너무긴코드'), ('00593a', '소문자코드')]
+
+
+def test_duplicates_are_reported_and_first_row_wins(universe):
+    assert universe.issues['duplicate_code'] == [('028100', '동아지질', 'KCC건설')]
+    assert universe.issues['duplicate_name'] == [('삼성전자', '035420', '005930')]
+    assert universe.name('028100') == 'KCC건설'
+    assert universe.code('삼성전자') == '005930'
+    assert len(universe) == 6
+    assert not universe.ok
+
+
+def test_bidirectional_map_and_attributes(universe):
+    assert universe.code(universe.name('000660')) == '000660'
+    assert universe.market('0001A0') == 'KOSDAQ'
+    assert universe.sector('005930') == '반도체'
+    assert universe.items()[0] == ('삼성전자', '005930')
+    assert Universe(ROWS[:2]).ok
+
+
+def test_choseong():
+    assert choseong('삼성전자') == 'ㅅㅅㅈㅈ'
+    assert choseong('SK하이닉스') == 'SKㅎㅇㄴㅅ'
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('삼성', ['005930', '028050']),                    # 이름 접두어 (스냅샷 순서)
+    ('ㅅㅅ', ['005930', '028050']),                    # 초성 접두어
+    ('ㅅㅅㅈ', ['005930']),
+    ('sk', ['000660']),                                # 대소문자/공백 무시
+    ('sk 하이', ['000660']),
+    ('028', ['028050', '028100']),                     # 코드 접두어
+    ('0001a', ['0001A0']),                             # 영숫자 코드도 대소문자 무시
+    ('005380', ['005380']),
+    ('없는종목', []),
+])
+def test_prefix_search(universe, query, expected):
+    assert universe.search(query) == expected
+
+
+def test_search_ranks_exact_match_first_and_limits(universe):
+    u = Universe([('000001', '삼성전자우', '', ''), ('000002', '삼성', '', ''), ('000003', '삼성생명', '', '')])
+    assert u.search('삼성') == ['000002', '000001', '000003']
+    assert u.search('삼성', limit=2) == ['000002', '000001']
+    assert universe.search('', limit=3) == universe.codes[:3]
@@ -0,0 +1,128 @@
+import csv
+import os
+import re
+import sys
+from bisect import bisect_left
+
+# --- 종목 유니버스: 로컬 KRX 상장 스냅샷 -> 코드<->이름 양방향 맵 + 시장/업종 + 접두어/초성 검색 인덱스 ---
+
+SNAPSHOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "krx_listing.csv")
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+CODE_RE = re.compile(r'[0-9A-Z]{6}')   # 숫자 6자리 또는 신규 영숫자 코드('0001A0' 등)
+
+
+def choseong(text):
+    # '삼성전자' -> 'ㅅㅅㅈㅈ' (한글 음절이 아니면 그대로)
+    out = []
+    for ch in text:
+        o = ord(ch) - 0xAC00
+        out.append(CHOSEONG[o // 588] if 0 <= o < 11172 else ch)
+    return ''.join(out)
+
+
+def _norm(text):
+    return text.replace(' ', '').lower()
+
+
+class Universe:
+    def __init__(self, rows):
+        # rows: (code, name, market, sector) 순서 = 화면에 보여줄 기본 순서
+        self.codes, self.names, self.markets, self.sectors = [], [], [], []
+        self.issues = {'duplicate_code': [], 'duplicate_name': [], 'invalid_code': []}
+        self._by_code, self._by_name = {}, {}
+        for code, name, market, sector in rows:
+            code, name = code.strip(), name.strip()
+            # 앞자리 0은 숫자로만 된 코드(스프레드시트를 거치며 빠진 경우)에만 채운다 -> 'ABC'가 '000ABC'로 검증을 통과하지 않게
+            if code.isdigit():
+                code = code.zfill(6)
+            if not CODE_RE.fullmatch(code):
+                self.issues['invalid_code'].append((code, name))
+                continue
+            if code in self._by_code:
+                self.issues['duplicate_code'].append((code, name, self.names[self._by_code[code]]))
+                continue
+            if name in self._by_name:
+                self.issues['duplicate_name'].append((name, code, self.codes[self._by_name[name]]))
+                continue
+            self._by_code[code] = self._by_name[name] = len(self.codes)
+            self.codes.append(code)
+            self.names.append(name)
+            self.markets.append(market or '')
+            self.sectors.append(sector or '')
+
+        # 접두어 검색용 정렬 키 배열: 이름 / 초성 / 코드 를 한 배열에 넣고 bisect로 범위 탐색
+        keys = []
+        for i, (code, name) in enumerate(zip(self.codes, self.names)):
+            keys.append((_norm(name), i))
+            keys.append((choseong(_norm(name)), i))
+            keys.append((_norm(code), i))             # 질의와 같이 소문자로 ('0001a0' -> '0001A0')
+        keys.sort()
+        self._keys = [k for k, _ in keys]
+        self._idx = [i for _, i in keys]
+
+    @classmethod
+    def load(cls, path=SNAPSHOT):
+        with open(path, newline='', encoding='utf-8') as f:
+            return cls((r['Code'], r['Name'], r.get('Market'), r.get('Sector')) for r in csv.DictReader(f))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return code in self._by_code
+
+    # --- 양방향 맵 / 속성 ---
+    def name(self, code):
+        return self.names[self._by_code[code]]
+
+    def code(self, name):
+        return self.codes[self._by_name[name]]
+
+    def market(self, code):
+        return self.markets[self._by_code[code]]
+
+    def sector(self, code):
+        return self.sectors[self._by_code[code]]
+
+    def items(self):
+        return list(zip(self.names, self.codes))
+
+    @property
+    def ok(self):
+        return not any(self.issues.values())
+
+    # --- 타입어헤드 검색: 이름 접두어, 초성 접두어('ㅅㅅㅈ'), 코드 접두어 ---
+    def search(self, query, limit=30):
+        q = _norm(query)
+        if not q:
+            return self.codes[:limit]
+        lo = bisect_left(self._keys, q)
+        hits = set()
+        while lo < len(self._keys) and self._keys[lo].startswith(q):
+            hits.add(self._idx[lo])
+            lo += 1
+        # 정확히 일치 -> 기본 순서(스냅샷 순서) 우선
+        ranked = sorted(hits, key=lambda i: (_norm(self.names[i]) != q and _norm(self.codes[i]) != q, i))
+        return [self.codes[i] for i in ranked[:limit]]
+
+
+def refresh_snapshot(path=SNAPSHOT):
+    # 네트워크가 되는 곳에서 KRX 전체 상장 목록으로 스냅샷 갱신 (시장/업종 포함)
+    import FinanceDataReader as fdr
+    df = fdr.StockListing('KRX-DESC')
+    df = df[df['Code'].astype(str).str.fullmatch(CODE_RE.pattern)]
+    df[['Code', 'Name', 'Market', 'Sector']].fillna('').to_csv(path, index=False, encoding='utf-8')
+    return len(df)
+
+
+if __name__ == "__main__":
+    # python universe.py            -> 스냅샷 검증 (중복/잘못된 코드 보고)
+    # python universe.py --refresh  -> KRX에서 스냅샷 다시 받기
+    if "--refresh" in sys.argv:
+        print(f"{refresh_snapshot()}종목 저장: {SNAPSHOT}")
+    u = Universe.load()
+    print(f"{len(u)}종목 로드")
+    for kind, items in u.issues.items():
+        for item in items:
+            print(f"[{kind}] {item}")
+    sys.exit(0 if u.ok else 1)